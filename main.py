@@ -9,11 +9,66 @@ import os
 os.environ.setdefault("KMP_DUPLICATE_LIB_OK", "TRUE")
 
 import argparse
+import json
 import logging
+import tempfile
 import yaml
 import sys
 from pathlib import Path
 
+# Prefer the libyaml-backed loader when PyYAML was built with it; it parses
+# several times faster than the pure-Python SafeLoader.
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
+
+def load_config(config_path: Path) -> dict:
+    """Load the YAML config, reusing a JSON sidecar cache while it is fresh.
+
+    The cache lives next to the config as ``<name>.cache.json`` and its first
+    line records the source file's mtime (``# v:<mtime_ns>``).  A stale or
+    unreadable cache is ignored and rewritten after the YAML is parsed.
+    """
+    mtime = config_path.stat().st_mtime_ns
+    header = f"# v:{mtime}\n"
+    cache_path = config_path.with_suffix(config_path.suffix + ".cache.json")
+
+    try:
+        with open(cache_path) as f:
+            if f.readline() == header:
+                return json.load(f)
+    except (OSError, ValueError):
+        pass
+
+    with open(config_path) as f:
+        config = yaml.load(f, Loader=_YamlLoader) or {}
+
+    # Only cache configs JSON reproduces exactly: int keys would come back as
+    # strings, and dates or sets cannot be encoded at all.
+    try:
+        payload = json.dumps(config)
+    except (TypeError, ValueError):
+        payload = None
+    if payload is None or json.loads(payload) != config:
+        logging.getLogger(__name__).debug("Config is not JSON round-trippable; not caching.")
+        return config
+
+    try:
+        fd, tmp_path = tempfile.mkstemp(dir=cache_path.parent, prefix=cache_path.name, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                f.write(header)
+                f.write(payload)
+            os.replace(tmp_path, cache_path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    except OSError as e:
+        logging.getLogger(__name__).debug(f"Could not write config cache: {e}")
+    return config
+
 
 def main():
     parser = argparse.ArgumentParser(description="Local LLM AI Tutor")
@@ -33,8 +88,7 @@ def main():
     config = {}
     config_path = Path(args.config)
     if config_path.exists():
-        with open(config_path) as f:
-            config = yaml.safe_load(f) or {}
+        config = load_config(config_path)
 
     quiz_cfg = config.get("quiz", {})
     tts_cfg = config.get("tts", {})
@@ -49,13 +103,12 @@ def main():
 
     sys.path.insert(0, str(Path(__file__).parent / "src"))
 
+    # Audio components (TTS/STT/VAD) are imported only when voice mode is used,
+    # so --text-only never loads sounddevice, pyttsx3 or faster-whisper.
     from local_llm_tutor.quiz_engine import QuizEngine
     from local_llm_tutor.evaluation_engine import EvaluationEngine
-    from local_llm_tutor.tts_module import TTSModule
-    from local_llm_tutor.stt_module import STTModule
     from local_llm_tutor.feedback_generator import FeedbackGenerator
     from local_llm_tutor.session_manager import SessionManager
-    from local_llm_tutor.audio_controller import AudioController
     from local_llm_tutor.llm_core import LLMCore
     from local_llm_tutor.tutor import Tutor
 
@@ -69,40 +122,45 @@ def main():
     evaluation_engine = EvaluationEngine(
         threshold_correct=eval_cfg.get("semantic_threshold_correct", 0.75),
         threshold_partial=eval_cfg.get("semantic_threshold_partial", 0.45),
+        quantize_embeddings=eval_cfg.get("quantize_embeddings", True),
+        onnx_model_dir=eval_cfg.get("onnx_model_dir", "models/minilm-int8"),
     )
-
-    class DummyTTS:
-        def speak(self, text, blocking=True): pass
-        def stop(self): pass
-        def is_speaking(self): return False
+    evaluation_engine.precompute_expected(quiz_engine.questions)
 
     if text_only:
-        tts_module = DummyTTS()
+        tts_module = None
+        stt_module = None
+        audio_ctrl = None
     else:
+        from local_llm_tutor.tts_module import TTSModule
+        from local_llm_tutor.stt_module import STTModule
+        from local_llm_tutor.audio_controller import AudioController
+
         tts_module = TTSModule(
             rate=tts_cfg.get("rate", 150),
             volume=tts_cfg.get("volume", 1.0),
             voice_index=tts_cfg.get("voice_index", 0),
             voice_gender=tts_cfg.get("voice_gender"),
+            reinit_per_utterance=tts_cfg.get("reinit_per_utterance", False),
+        )
+        stt_module = STTModule(
+            model_size=stt_cfg.get("model", "base"),
+            language=stt_cfg.get("language", "en"),
+            energy_threshold=stt_cfg.get("energy_threshold", 300),
+        )
+        audio_ctrl = AudioController(
+            energy_threshold=stt_cfg.get("energy_threshold", 300),
         )
-
-    stt_module = STTModule(
-        model_size=stt_cfg.get("model", "base"),
-        language=stt_cfg.get("language", "en"),
-        energy_threshold=stt_cfg.get("energy_threshold", 300),
-    )
 
     llm_core = LLMCore(
         model=llm_cfg.get("model", "llama3.2"),
         base_url=llm_cfg.get("base_url", "http://localhost:11434"),
         enabled=llm_cfg.get("enabled", False),
+        keep_alive=llm_cfg.get("keep_alive", "5m"),
     )
 
     feedback_gen = FeedbackGenerator(llm_core=llm_core)
     session_mgr = SessionManager(db_path=session_cfg.get("db_path", "tutor_sessions.db"))
-    audio_ctrl = AudioController(
-        energy_threshold=stt_cfg.get("energy_threshold", 300),
-    ) if not text_only else None
 
     tutor = Tutor(
         quiz_engine=quiz_engine,
@@ -116,7 +174,10 @@ def main():
         text_only=text_only,
     )
 
-    tutor.run()
+    try:
+        tutor.run()
+    finally:
+        session_mgr.close()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""Export all-MiniLM-L6-v2 to ONNX with int8 dynamic quantization.
+
+The evaluator loads the result with onnxruntime instead of sentence-transformers,
+which avoids importing torch at startup.  Requires ``optimum[onnxruntime]``:
+
+    pip install "optimum[onnxruntime]"
+    python scripts/export_minilm_onnx.py --output models/minilm-int8
+"""
+
+import argparse
+import tempfile
+
+MODEL_ID = "sentence-transformers/all-MiniLM-L6-v2"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export MiniLM to int8 ONNX")
+    parser.add_argument("--model", default=MODEL_ID, help="Hugging Face model ID")
+    parser.add_argument("--output", default="models/minilm-int8", help="Output directory")
+    args = parser.parse_args()
+
+    from optimum.onnxruntime import ORTModelForFeatureExtraction, ORTQuantizer
+    from optimum.onnxruntime.configuration import AutoQuantizationConfig
+    from transformers import AutoTokenizer
+
+    tokenizer = AutoTokenizer.from_pretrained(args.model)
+    tokenizer.save_pretrained(args.output)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        model = ORTModelForFeatureExtraction.from_pretrained(args.model, export=True)
+        model.save_pretrained(tmp_dir)
+        quantizer = ORTQuantizer.from_pretrained(tmp_dir)
+        qconfig = AutoQuantizationConfig.avx512_vnni(is_static=False, per_channel=False)
+        quantizer.quantize(save_dir=args.output, quantization_config=qconfig)
+
+    print(f"Exported int8 ONNX model to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -11,6 +11,8 @@ setup(
         "pyttsx3>=2.90",
         "numpy>=1.24.0",
         "scipy>=1.10.0",
+        # Install PyYAML against libyaml (e.g. system libyaml-dev) to enable
+        # the faster CSafeLoader used by main.py; SafeLoader is the fallback.
         "PyYAML>=6.0",
         "sentence-transformers>=2.2.2",
     ],
@@ -19,9 +21,20 @@ setup(
             "sounddevice>=0.4.6",
             "faster-whisper>=1.0.0",
         ],
+        "onnx": [
+            "onnxruntime>=1.16.0",
+            "tokenizers>=0.15.0",
+        ],
+        "speedups": [
+            "pyahocorasick>=2.0.0",
+            "rapidfuzz>=3.0.0",
+            "orjson>=3.8.0",
+            "numba>=0.58.0",
+        ],
         "dev": [
             "pytest>=7.4.0",
             "pytest-cov>=4.1.0",
+            "pytest-xdist>=3.3.0",
         ],
     },
     entry_points={
@@ -1,6 +1,42 @@
 """Local LLM Tutor - A locally hosted AI tutor with voice interaction."""
 
-from local_llm_tutor.tutor import Tutor
+import importlib
+import os
 
-__all__ = ["Tutor"]
+# Public names are resolved lazily (PEP 562) so that importing the package does
+# not pull in numpy, torch or the audio stack until a component is actually used.
+# Set LLMTUTOR_EAGER_IMPORT=1 to import everything up front (e.g. in CI).
+_LAZY_ATTRS = {
+    "Tutor": "local_llm_tutor.tutor",
+    "QuizEngine": "local_llm_tutor.quiz_engine",
+    "EvaluationEngine": "local_llm_tutor.evaluation_engine",
+    "EvaluationResult": "local_llm_tutor.evaluation_engine",
+    "FeedbackGenerator": "local_llm_tutor.feedback_generator",
+    "SessionManager": "local_llm_tutor.session_manager",
+    "LLMCore": "local_llm_tutor.llm_core",
+    "TTSModule": "local_llm_tutor.tts_module",
+    "STTModule": "local_llm_tutor.stt_module",
+    "AudioController": "local_llm_tutor.audio_controller",
+}
+
+__all__ = list(_LAZY_ATTRS)
 __version__ = "0.1.0"
+
+
+def __getattr__(name):
+    module_name = _LAZY_ATTRS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
+
+if os.environ.get("LLMTUTOR_EAGER_IMPORT") == "1":
+    for _name in __all__:
+        __getattr__(_name)
+    del _name
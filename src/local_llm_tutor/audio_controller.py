@@ -1,6 +1,8 @@
 """Audio I/O Controller: Manages audio input/output with interrupt detection."""
 
+import collections
 import logging
+import math
 import threading
 import time
 import numpy as np
@@ -8,11 +10,29 @@ from typing import Optional, Callable
 
 logger = logging.getLogger(__name__)
 
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
 SAMPLE_RATE = 16000
 CHUNK_SIZE = 1024
 CHANNELS = 1
 
 
+if njit is not None:
+    @njit(cache=True)
+    def _sum_squares(buf):
+        """Fused int16 square-sum with int64 accumulation (no temporaries)."""
+        acc = 0
+        for i in range(buf.size):
+            v = np.int64(buf[i])
+            acc += v * v
+        return acc
+else:
+    _sum_squares = None
+
+
 class AudioController:
     """
     Manages audio I/O with full-duplex support and interrupt detection.
@@ -36,8 +56,39 @@ class AudioController:
         self._interrupt_callback = callback
 
     def _compute_rms(self, data: np.ndarray) -> float:
-        """Compute RMS energy of audio chunk."""
-        return float(np.sqrt(np.mean(data.astype(np.float32) ** 2)))
+        """Compute RMS energy of audio chunk, for debug logging; the hot-path
+        threshold check is _energy_above."""
+        if data.size == 0:
+            return 0.0
+        # Integer dot product avoids a float32 temporary per block; int64
+        # accumulation cannot overflow for int16 samples.
+        x = data.astype(np.int64, copy=False)
+        return math.sqrt(float(np.dot(x, x)) / x.size)
+
+    def warm_up(self):
+        """Import the audio backend and compile the energy kernel ahead of the
+        first recording, so neither happens inside the PortAudio callback."""
+        try:
+            import sounddevice  # noqa: F401
+        except ImportError:
+            pass
+        if _sum_squares is not None:
+            # Numba compiles on first call (~250 ms cold), far longer than
+            # one block period; compile against the callback's block type.
+            _sum_squares(np.zeros(CHUNK_SIZE, dtype=np.int16))
+
+    def _energy_above(self, data: np.ndarray, threshold: float) -> bool:
+        """Return True if the block's RMS energy exceeds *threshold*.
+
+        sqrt is monotonic, so the square-sum is compared against threshold² · N
+        directly; with Numba the square-sum is a single compiled pass.
+        """
+        if _sum_squares is not None:
+            sum_sq = _sum_squares(data)
+        else:
+            x = data.astype(np.int64, copy=False)
+            sum_sq = np.dot(x, x)
+        return bool(sum_sq > threshold * threshold * data.size)
 
     def record_with_vad(self, max_duration: float = 30.0) -> np.ndarray:
         """
@@ -51,34 +102,71 @@ class AudioController:
             return self._fixed_duration_record(5.0)
 
         logger.info("Listening... (speak now)")
-        frames = []
-        speech_started = False
-        silence_start = None
-        start_time = time.time()
+        # The PortAudio callback copies each block straight into a preallocated
+        # ring and queues its (start, end, voiced) triple; this thread only scans
+        # the energy timeline, so no per-block Python read or final concat is needed.
+        ring = np.empty(int(max_duration * self.sample_rate), dtype=np.int16)
+        energies = collections.deque()
+        ring_full = threading.Event()
+        write_pos = 0
+
+        def callback(indata, frames, time_info, status):
+            nonlocal write_pos
+            if status:
+                logger.debug(f"Input stream status: {status}")
+            n = min(frames, ring.size - write_pos)
+            if n <= 0:
+                ring_full.set()
+                return
+            block = indata[:n, 0]
+            ring[write_pos:write_pos + n] = block
+            energies.append((write_pos, write_pos + n,
+                             self._energy_above(block, self.energy_threshold)))
+            write_pos += n
+            if write_pos >= ring.size:
+                ring_full.set()
+
+        silence_samples = self.silence_duration * self.sample_rate
+        poll_interval = CHUNK_SIZE / self.sample_rate / 2
+        # Wall-clock cap in case the stream stops delivering blocks (device
+        # unplugged, stream aborted) and the ring never fills.
+        deadline = time.monotonic() + max_duration + CHUNK_SIZE / self.sample_rate
+        speech_start = None
+        last_voiced_end = 0
+        stop_pos = None
 
         with sd.InputStream(samplerate=self.sample_rate, channels=CHANNELS,
-                           dtype="int16", blocksize=CHUNK_SIZE) as stream:
-            while (time.time() - start_time) < max_duration:
-                data, overflowed = stream.read(CHUNK_SIZE)
-                rms = self._compute_rms(data.flatten())
-
-                if rms > self.energy_threshold:
-                    speech_started = True
-                    silence_start = None
-                    frames.append(data.flatten())
-                elif speech_started:
-                    frames.append(data.flatten())
-                    if silence_start is None:
-                        silence_start = time.time()
-                    elif (time.time() - silence_start) > self.silence_duration:
+                           dtype="int16", blocksize=CHUNK_SIZE, callback=callback):
+            while stop_pos is None:
+                drained = ring_full.is_set()
+                while energies:
+                    start, end, voiced = energies.popleft()
+                    if voiced:
+                        if speech_start is None:
+                            speech_start = start
+                            if logger.isEnabledFor(logging.DEBUG):
+                                logger.debug(f"Speech onset, block RMS "
+                                             f"{self._compute_rms(ring[start:end]):.0f}")
+                        last_voiced_end = end
+                    elif speech_start is not None and (end - last_voiced_end) > silence_samples:
                         logger.info("Silence detected, stopping recording.")
+                        stop_pos = end
                         break
-
-        if not frames:
+                if stop_pos is None and drained:
+                    stop_pos = write_pos
+                elif stop_pos is None and time.monotonic() > deadline:
+                    logger.warning("Input stream stalled; stopping recording.")
+                    stop_pos = write_pos
+                elif stop_pos is None:
+                    ring_full.wait(poll_interval)
+
+        if speech_start is None:
             return np.zeros(1)
 
-        audio = np.concatenate(frames).astype(np.float32) / 32767.0
-        return audio
+        # One fused int16 -> float32 scale: a single output allocation instead of
+        # an astype copy followed by a divide temporary.
+        return np.multiply(ring[speech_start:stop_pos], np.float32(1.0 / 32767.0),
+                           dtype=np.float32)
 
     def _fixed_duration_record(self, duration: float = 5.0) -> np.ndarray:
         """Fallback fixed-duration recording without VAD."""
@@ -103,13 +191,12 @@ class AudioController:
                                dtype="int16", blocksize=CHUNK_SIZE) as stream:
                 while not stop_event.is_set():
                     data, _ = stream.read(CHUNK_SIZE)
-                    rms = self._compute_rms(data.flatten())
-                    if rms > self.energy_threshold * 2:
+                    if self._energy_above(data[:, 0], self.energy_threshold * 2):
                         logger.info("Interrupt detected during TTS.")
+                        logger.debug(f"Interrupt block RMS {self._compute_rms(data[:, 0]):.0f}")
                         tts_module.stop()
                         if self._interrupt_callback:
                             self._interrupt_callback()
                         break
-                    time.sleep(0.01)
         except Exception as e:
             logger.debug(f"Interrupt monitor stopped: {e}")
@@ -1,12 +1,159 @@
 """Evaluation Engine: Multi-layer answer evaluation."""
 
+import queue
 import re
+import threading
+import time
+from concurrent.futures import Future
 from difflib import SequenceMatcher
+from functools import lru_cache
 from typing import Optional
 import logging
 
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+try:
+    from rapidfuzz.fuzz import ratio as _fuzz_ratio
+except ImportError:
+    _fuzz_ratio = None
+
 logger = logging.getLogger(__name__)
 
+_INT8_MAX = 127.0
+_NORM_RE = re.compile(r"[^\w\s]")
+
+
+def _quantize_int8(embedding) -> tuple:
+    """Quantize an embedding to int8 with a per-vector scale; returns (q, |q|).
+
+    Normalized 384-d MiniLM components only reach about ±0.17, so scaling by
+    127 / max|x| uses the full int8 range instead of a fixed ×127, which
+    would leave ~6x more rounding error in the dot product.  The scale itself
+    cancels out of the cosine, so only the quantized vector's norm is kept.
+    """
+    import numpy as np
+    x = np.asarray(embedding, dtype=np.float32)
+    peak = float(np.max(np.abs(x))) if x.size else 0.0
+    q = np.round(x * (_INT8_MAX / peak if peak > 0 else 1.0)).astype(np.int8)
+    norm = float(np.sqrt(np.dot(q.astype(np.int32), q.astype(np.int32))))
+    return q, norm or 1.0
+
+
+@lru_cache(maxsize=256)
+def _concept_matcher(concepts: tuple):
+    """Build a single-pass matcher for lowercased concepts.
+
+    Returns a function mapping lowercased answer text to the set of concepts
+    it contains, with the same semantics as ``concept in text`` per concept
+    (overlapping matches included).
+    """
+    concepts = tuple(c for c in dict.fromkeys(concepts) if c)
+    if not concepts:
+        return lambda text: set()
+
+    if ahocorasick is not None:
+        automaton = ahocorasick.Automaton()
+        for concept in concepts:
+            automaton.add_word(concept, concept)
+        automaton.make_automaton()
+        return lambda text: {c for _, c in automaton.iter(text)}
+
+    # A zero-width lookahead finds a match at every start position.  With the
+    # longest alternatives first, the match at a position is the longest
+    # concept there, and every other concept matching at that position is one
+    # of its prefixes.
+    ordered = sorted(concepts, key=len, reverse=True)
+    pattern = re.compile("(?=(" + "|".join(map(re.escape, ordered)) + "))")
+    prefixes = {c: {p for p in concepts if c.startswith(p)} for c in concepts}
+
+    def match(text):
+        found = set()
+        for m in pattern.finditer(text):
+            found |= prefixes[m.group(1)]
+        return found
+    return match
+
+
+class _EncodeBatcher:
+    """
+    Coalesces single-text encode requests from any thread into batched
+    forward passes: a batch is flushed when it reaches *max_batch* texts or
+    *max_wait* seconds after its first request arrived.
+    """
+
+    def __init__(self, embedder, max_batch: int = 32, max_wait: float = 0.02):
+        self._embedder = embedder
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self._queue: queue.Queue = queue.Queue()
+        # Guards _closed so no request can be queued behind the stop sentinel.
+        self._lock = threading.Lock()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="encode-batcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, text: str) -> Future:
+        future: Future = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Encode batcher is closed.")
+            self._queue.put((text, future))
+        return future
+
+    def close(self):
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(None)
+        self._thread.join()
+        # Requests queued ahead of the sentinel are flushed by _run; fail any
+        # that were left behind (e.g. if the worker died) instead of hanging.
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not None:
+                item[1].set_exception(RuntimeError("Encode batcher is closed."))
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is None:
+                return
+            batch = [item]
+            deadline = time.monotonic() + self.max_wait
+            while len(batch) < self.max_batch:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+            self._flush(batch)
+
+    def _flush(self, batch: list):
+        try:
+            embeddings = self._embedder.encode(
+                [text for text, _ in batch], batch_size=len(batch), convert_to_numpy=True,
+                normalize_embeddings=True, show_progress_bar=False)
+        except Exception as e:
+            for _, future in batch:
+                future.set_exception(e)
+            return
+        for (_, future), emb in zip(batch, embeddings):
+            future.set_result(emb)
+
 
 class EvaluationResult:
     """Holds the result of answer evaluation."""
@@ -37,27 +184,129 @@ class EvaluationResult:
 class EvaluationEngine:
     """Evaluates user answers using exact match, semantic similarity, and concept detection."""
 
-    def __init__(self, threshold_correct: float = 0.75, threshold_partial: float = 0.45):
+    def __init__(self, threshold_correct: float = 0.75, threshold_partial: float = 0.45,
+                 quantize_embeddings: bool = True,
+                 onnx_model_dir: Optional[str] = "models/minilm-int8"):
         self.threshold_correct = threshold_correct
         self.threshold_partial = threshold_partial
+        self.onnx_model_dir = onnx_model_dir
+        # int8 embeddings halve memory and use integer dot products; set False
+        # to keep the exact float32 path (e.g. for accuracy regression checks).
+        self.quantize_embeddings = quantize_embeddings
         self._embedder = None
+        self._batcher: Optional[_EncodeBatcher] = None
+        # Serializes the lazy creation of the embedder and the batcher, which
+        # encode_async() may trigger from several threads at once.
+        self._init_lock = threading.Lock()
+        # L2-normalized embeddings of expected answers, keyed by answer text.
+        self._expected_emb: dict = {}
 
     def _get_embedder(self):
-        """Lazy-load sentence transformer for semantic similarity."""
-        if self._embedder is None:
-            try:
-                from sentence_transformers import SentenceTransformer
-                self._embedder = SentenceTransformer("all-MiniLM-L6-v2")
-                logger.info("Loaded sentence-transformers model.")
-            except ImportError:
-                logger.warning("sentence-transformers not available; using fallback similarity.")
-                self._embedder = "fallback"
+        """Lazy-load the embedding model for semantic similarity.
+
+        Prefers an int8 ONNX export run through onnxruntime (no torch import),
+        then sentence-transformers, then the string-similarity fallback.
+        """
+        if self._embedder is not None:
+            return self._embedder
+        with self._init_lock:
+            if self._embedder is None:
+                self._embedder = self._load_embedder()
         return self._embedder
 
+    def _load_embedder(self):
+        if self.onnx_model_dir:
+            from local_llm_tutor.onnx_embedder import OnnxEmbedder
+            if OnnxEmbedder.is_available(self.onnx_model_dir):
+                try:
+                    embedder = OnnxEmbedder(self.onnx_model_dir)
+                    logger.info(f"Loaded ONNX embedding model from {self.onnx_model_dir}.")
+                    return embedder
+                except Exception as e:
+                    logger.warning(f"ONNX embedder unavailable ({e}); trying sentence-transformers.")
+        try:
+            from sentence_transformers import SentenceTransformer
+            embedder = SentenceTransformer("all-MiniLM-L6-v2")
+            logger.info("Loaded sentence-transformers model.")
+            return embedder
+        except ImportError:
+            logger.warning("sentence-transformers not available; using fallback similarity.")
+            return "fallback"
+
+    def precompute_expected(self, questions: list):
+        """Embed all expected answers in one batched call ahead of the quiz."""
+        embedder = self._get_embedder()
+        if embedder == "fallback":
+            return
+        answers = list(dict.fromkeys(
+            q.get("expected_answer", "") for q in questions
+            if q.get("expected_answer", "") not in self._expected_emb
+        ))
+        if not answers:
+            return
+        try:
+            embeddings = embedder.encode(answers, batch_size=64, show_progress_bar=False,
+                                         convert_to_numpy=True, normalize_embeddings=True)
+            self._expected_emb.update(
+                (answer, self._store_embedding(emb)) for answer, emb in zip(answers, embeddings)
+            )
+            logger.info(f"Precomputed {len(answers)} expected-answer embeddings.")
+        except Exception as e:
+            logger.error(f"Expected-answer precompute error: {e}")
+
+    def encode_async(self, text: str) -> Future:
+        """Queue *text* for a batched encode; resolves to its normalized embedding.
+
+        Useful when many answers arrive together (e.g. several students);
+        concurrent requests share one forward pass.
+        """
+        embedder = self._get_embedder()
+        if embedder == "fallback":
+            future: Future = Future()
+            future.set_exception(RuntimeError("No embedding model available."))
+            return future
+        with self._init_lock:
+            if self._batcher is None:
+                self._batcher = _EncodeBatcher(embedder)
+            batcher = self._batcher
+        return batcher.submit(text)
+
+    def close(self):
+        """Stop the background encode batcher, if one was started."""
+        with self._init_lock:
+            batcher, self._batcher = self._batcher, None
+        if batcher is not None:
+            batcher.close()
+
+    def _store_embedding(self, embedding):
+        if self.quantize_embeddings:
+            return _quantize_int8(embedding)
+        import numpy as np
+        return np.asarray(embedding, dtype=np.float32)
+
+    def _expected_embedding(self, embedder, expected_answer: str):
+        emb = self._expected_emb.get(expected_answer)
+        if emb is None:
+            emb = self._store_embedding(embedder.encode(
+                expected_answer, convert_to_numpy=True, normalize_embeddings=True))
+            self._expected_emb[expected_answer] = emb
+        return emb
+
+    def _embedding_similarity(self, user_emb, expected_emb) -> float:
+        """Cosine similarity of two L2-normalized embeddings."""
+        if self.quantize_embeddings:
+            import numpy as np
+            qu, nu = _quantize_int8(user_emb)
+            qe, ne = expected_emb
+            dot = float(np.dot(qu.astype(np.int32), qe.astype(np.int32))) / (nu * ne)
+            # Rounding error can push identical vectors slightly past 1.0.
+            return max(-1.0, min(1.0, dot))
+        return float(user_emb @ expected_emb)
+
     def check_exact_match(self, user_answer: str, expected_answer: str) -> bool:
         """Check if user answer is an exact or near-exact match."""
-        normalize = lambda s: re.sub(r"[^\w\s]", "", s.lower()).strip()
-        return normalize(user_answer) == normalize(expected_answer)
+        return (_NORM_RE.sub("", user_answer.lower()).strip()
+                == _NORM_RE.sub("", expected_answer.lower()).strip())
 
     def compute_semantic_similarity(self, user_answer: str, expected_answer: str) -> float:
         """Compute semantic similarity between answers."""
@@ -65,30 +314,30 @@ class EvaluationEngine:
         if embedder == "fallback":
             return self._fallback_similarity(user_answer, expected_answer)
         try:
-            import numpy as np
-            embeddings = embedder.encode([user_answer, expected_answer])
-            # Cosine similarity
-            a, b = embeddings[0], embeddings[1]
-            norm_a = np.linalg.norm(a)
-            norm_b = np.linalg.norm(b)
-            if norm_a == 0 or norm_b == 0:
-                return 0.0
-            return float(np.dot(a, b) / (norm_a * norm_b))
+            # Both embeddings are L2-normalized, so cosine similarity is a dot product.
+            expected_emb = self._expected_embedding(embedder, expected_answer)
+            user_emb = embedder.encode(user_answer, convert_to_numpy=True,
+                                       normalize_embeddings=True)
+            return self._embedding_similarity(user_emb, expected_emb)
         except Exception as e:
             logger.error(f"Semantic similarity error: {e}")
             return self._fallback_similarity(user_answer, expected_answer)
 
     def _fallback_similarity(self, text1: str, text2: str) -> float:
-        """Fallback similarity using SequenceMatcher."""
-        return SequenceMatcher(None, text1.lower(), text2.lower()).ratio()
+        """Fallback similarity using RapidFuzz, or SequenceMatcher if unavailable."""
+        text1, text2 = text1.lower(), text2.lower()
+        if _fuzz_ratio is not None:
+            return _fuzz_ratio(text1, text2) / 100.0
+        return SequenceMatcher(None, text1, text2).ratio()
 
     def detect_key_concepts(self, user_answer: str, key_concepts: list) -> tuple:
         """Detect which key concepts are present in the user answer."""
-        answer_lower = user_answer.lower()
+        concepts_lower = [concept.lower() for concept in key_concepts]
+        found = _concept_matcher(tuple(concepts_lower))(user_answer.lower())
         matched = []
         missing = []
-        for concept in key_concepts:
-            if concept.lower() in answer_lower:
+        for concept, concept_lower in zip(key_concepts, concepts_lower):
+            if not concept_lower or concept_lower in found:
                 matched.append(concept)
             else:
                 missing.append(concept)
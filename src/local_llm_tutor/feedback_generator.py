@@ -2,7 +2,9 @@
 
 import logging
 import random
-from typing import Optional
+from functools import lru_cache
+from string import Formatter
+from typing import Iterator, Optional
 
 logger = logging.getLogger(__name__)
 
@@ -33,6 +35,40 @@ REINFORCEMENTS = [
 ]
 
 
+def _compile_template(template: str) -> tuple:
+    """Pre-parse a format template into (literal, field_name) pairs."""
+    return tuple((literal, field) for literal, field, _, _ in Formatter().parse(template))
+
+
+def _render(compiled: tuple, **values) -> str:
+    return "".join(literal + (values[field] if field else "") for literal, field in compiled)
+
+
+# Every correct-feedback line is fully static, so render the template x
+# reinforcement cross product once; the other verdicts are pre-parsed.
+_CORRECT_RENDERED = tuple(t.format(reinforcement=r) for t in CORRECT_TEMPLATES for r in REINFORCEMENTS)
+_PARTIAL_COMPILED = tuple(_compile_template(t) for t in PARTIAL_TEMPLATES)
+_INCORRECT_COMPILED = tuple(_compile_template(t) for t in INCORRECT_TEMPLATES)
+
+
+@lru_cache(maxsize=64)
+def _render_template(verdict: str, index: int, expected: str, missing_key: tuple = ()) -> str:
+    """Render partial/incorrect template *index* for one question.
+
+    The template is still picked at random by the caller; only the rendering
+    is memoised, since a session keeps revisiting the same few inputs.
+    """
+    if verdict == "partial":
+        if missing_key:
+            missing_hint = f"You missed these key concepts: {', '.join(missing_key)}."
+        else:
+            missing_hint = "Your answer was close but needs more detail."
+        hint = f"The complete answer should mention: {expected[:100]}..." if len(expected) > 100 else f"The answer is: {expected}"
+        return _render(_PARTIAL_COMPILED[index], missing_hint=missing_hint, hint=hint)
+    explanation = f"The correct answer is: {expected}"
+    return _render(_INCORRECT_COMPILED[index], explanation=explanation)
+
+
 class FeedbackGenerator:
     """Generates adaptive feedback based on evaluation results."""
 
@@ -41,76 +77,75 @@ class FeedbackGenerator:
 
     def generate(self, evaluation_result, question: dict) -> str:
         """Generate feedback text based on evaluation result."""
-        verdict = evaluation_result.verdict
-
-        if verdict == "correct":
-            return self._correct_feedback(evaluation_result, question)
-        elif verdict == "partial":
-            return self._partial_feedback(evaluation_result, question)
-        else:
-            return self._incorrect_feedback(evaluation_result, question)
-
-    def _correct_feedback(self, result, question: dict) -> str:
-        reinforcement = random.choice(REINFORCEMENTS)
-        template = random.choice(CORRECT_TEMPLATES)
+        llm_kwargs, template_text = self._feedback_parts(evaluation_result, question)
         # Try LLM-enhanced feedback
         if self._llm and self._llm.is_available():
             try:
-                enhanced = self._llm.generate_feedback(
-                    verdict="correct",
-                    question=question.get("question", ""),
-                    expected=question.get("expected_answer", ""),
-                )
+                enhanced = self._llm.generate_feedback(**llm_kwargs)
                 if enhanced:
                     return enhanced
             except Exception as e:
                 logger.debug(f"LLM feedback failed, using template: {e}")
-        return template.format(reinforcement=reinforcement)
-
-    def _partial_feedback(self, result, question: dict) -> str:
-        missing = result.missing_concepts
-        if missing:
-            missing_hint = f"You missed these key concepts: {', '.join(missing[:3])}."
-        else:
-            missing_hint = "Your answer was close but needs more detail."
+        return template_text
 
-        expected = question.get("expected_answer", "")
-        hint = f"The complete answer should mention: {expected[:100]}..." if len(expected) > 100 else f"The answer is: {expected}"
+    def generate_stream(self, evaluation_result, question: dict) -> Iterator[str]:
+        """Like generate(), but yields LLM feedback incrementally as it is decoded.
 
+        Lets the caller start speaking the first sentence while the rest is
+        still being generated.  Falls back to the template text if the LLM is
+        unavailable or produces nothing.
+        """
+        llm_kwargs, template_text = self._feedback_parts(evaluation_result, question)
+        produced = False
         if self._llm and self._llm.is_available():
             try:
-                enhanced = self._llm.generate_feedback(
-                    verdict="partial",
-                    question=question.get("question", ""),
-                    expected=expected,
-                    missing_concepts=missing,
-                )
-                if enhanced:
-                    return enhanced
+                for chunk in self._llm.generate_feedback_stream(**llm_kwargs):
+                    produced = True
+                    yield chunk
             except Exception as e:
-                logger.debug(f"LLM feedback failed, using template: {e}")
+                logger.debug(f"LLM feedback stream failed: {e}")
+        if not produced:
+            yield template_text
 
-        template = random.choice(PARTIAL_TEMPLATES)
-        return template.format(missing_hint=missing_hint, hint=hint)
+    def _feedback_parts(self, result, question: dict) -> tuple:
+        """Return (LLM feedback kwargs, template fallback text) for a result."""
+        verdict = result.verdict
+        if verdict == "correct":
+            return self._correct_feedback(result, question)
+        elif verdict == "partial":
+            return self._partial_feedback(result, question)
+        else:
+            return self._incorrect_feedback(result, question)
 
-    def _incorrect_feedback(self, result, question: dict) -> str:
-        expected = question.get("expected_answer", "")
-        explanation = f"The correct answer is: {expected}"
+    def _correct_feedback(self, result, question: dict) -> tuple:
+        llm_kwargs = dict(
+            verdict="correct",
+            question=question.get("question", ""),
+            expected=question.get("expected_answer", ""),
+        )
+        return llm_kwargs, _CORRECT_RENDERED[random.randrange(len(_CORRECT_RENDERED))]
 
-        if self._llm and self._llm.is_available():
-            try:
-                enhanced = self._llm.generate_feedback(
-                    verdict="incorrect",
-                    question=question.get("question", ""),
-                    expected=expected,
-                )
-                if enhanced:
-                    return enhanced
-            except Exception as e:
-                logger.debug(f"LLM feedback failed, using template: {e}")
+    def _partial_feedback(self, result, question: dict) -> tuple:
+        missing = result.missing_concepts
+        expected = question.get("expected_answer", "")
+        llm_kwargs = dict(
+            verdict="partial",
+            question=question.get("question", ""),
+            expected=expected,
+            missing_concepts=missing,
+        )
+        index = random.randrange(len(_PARTIAL_COMPILED))
+        return llm_kwargs, _render_template("partial", index, expected, tuple(missing[:3]))
 
-        template = random.choice(INCORRECT_TEMPLATES)
-        return template.format(explanation=explanation)
+    def _incorrect_feedback(self, result, question: dict) -> tuple:
+        expected = question.get("expected_answer", "")
+        llm_kwargs = dict(
+            verdict="incorrect",
+            question=question.get("question", ""),
+            expected=expected,
+        )
+        index = random.randrange(len(_INCORRECT_COMPILED))
+        return llm_kwargs, _render_template("incorrect", index, expected)
 
     def generate_intro(self, question: dict, question_num: int, total: int) -> str:
         """Generate intro text for a question."""
@@ -1,8 +1,11 @@
 """LLM Core: Local LLM integration via Ollama."""
 
+import http.client
 import logging
 import json
-from typing import Optional
+import time
+from typing import Iterator, Optional
+from urllib.parse import urlsplit
 
 logger = logging.getLogger(__name__)
 
@@ -11,65 +14,153 @@ class LLMCore:
     """Interfaces with a local LLM via Ollama for enhanced feedback generation."""
 
     def __init__(self, model: str = "llama3.2", base_url: str = "http://localhost:11434",
-                 enabled: bool = False):
+                 enabled: bool = False, keep_alive: str = "5m", timeout: float = 10.0):
         self.model = model
         self.base_url = base_url.rstrip("/")
         self.enabled = enabled
+        self.keep_alive = keep_alive  # how long Ollama keeps the model loaded
+        self.timeout = timeout
+        self._http: Optional[http.client.HTTPConnection] = None
         self._available: Optional[bool] = None
+        self._fail_count = 0
+        self._next_probe_time = 0.0
 
     def is_available(self) -> bool:
-        """Check if Ollama LLM is accessible."""
+        """Check if Ollama LLM is accessible.
+
+        A successful probe is cached for the lifetime of the instance.  Failed
+        probes are retried with exponential backoff (capped at 60s) so that a
+        missing server doesn't cost a blocking connect on every question.
+        """
         if not self.enabled:
             return False
-        if self._available is not None:
-            return self._available
+        if self._available:
+            return True
+        if self._available is False and time.monotonic() < self._next_probe_time:
+            return False
         try:
             import urllib.request
             req = urllib.request.urlopen(f"{self.base_url}/api/tags", timeout=2)
             self._available = req.status == 200
         except Exception:
             self._available = False
+        if self._available:
+            self._fail_count = 0
+        else:
+            self._mark_unavailable()
         return self._available
 
+    def _mark_unavailable(self):
+        """Record a failure and schedule the next availability probe."""
+        self._available = False
+        self._fail_count += 1
+        self._next_probe_time = time.monotonic() + min(60, 2 ** self._fail_count)
+
+    def _get_connection(self) -> http.client.HTTPConnection:
+        """Return the keep-alive connection to Ollama, creating it if needed."""
+        if self._http is None:
+            parts = urlsplit(self.base_url)
+            conn_cls = (http.client.HTTPSConnection if parts.scheme == "https"
+                        else http.client.HTTPConnection)
+            self._http = conn_cls(parts.hostname, parts.port, timeout=self.timeout)
+        return self._http
+
+    def close(self):
+        """Close the persistent HTTP connection."""
+        if self._http is not None:
+            self._http.close()
+            self._http = None
+
+    def _post(self, path: str, payload: dict) -> http.client.HTTPResponse:
+        """POST JSON over the persistent connection and return the response.
+
+        The caller must read the response fully before the next request.  A
+        connection dropped by the server while idle is reopened once.
+        """
+        body = json.dumps(payload).encode("utf-8")
+        headers = {"Content-Type": "application/json"}
+        url = urlsplit(self.base_url).path + path
+        for attempt in range(2):
+            conn = self._get_connection()
+            try:
+                conn.request("POST", url, body=body, headers=headers)
+                resp = conn.getresponse()
+                break
+            except (ConnectionError, http.client.HTTPException):
+                self.close()
+                if attempt:
+                    raise
+        if resp.status != 200:
+            resp.read()
+            raise RuntimeError(f"HTTP {resp.status} {resp.reason} from {path}")
+        return resp
+
     def generate(self, prompt: str, system: str = "") -> str:
         """Generate a response from the LLM."""
         if not self.is_available():
             return ""
         try:
-            import urllib.request
-            import json
-
             payload = {
                 "model": self.model,
                 "prompt": prompt,
                 "stream": False,
+                "keep_alive": self.keep_alive,
             }
             if system:
                 payload["system"] = system
 
-            data = json.dumps(payload).encode("utf-8")
-            req = urllib.request.Request(
-                f"{self.base_url}/api/generate",
-                data=data,
-                headers={"Content-Type": "application/json"},
-                method="POST",
-            )
-            with urllib.request.urlopen(req, timeout=10) as resp:
-                result = json.loads(resp.read().decode("utf-8"))
-                return result.get("response", "").strip()
+            resp = self._post("/api/generate", payload)
+            result = json.loads(resp.read().decode("utf-8"))
+            return result.get("response", "").strip()
         except Exception as e:
             logger.error(f"LLM generate error: {e}")
-            self._available = False
+            self.close()
+            self._mark_unavailable()
             return ""
 
-    def generate_feedback(self, verdict: str, question: str, expected: str,
-                          missing_concepts: Optional[list] = None) -> str:
-        """Generate tutor feedback using the LLM."""
+    def generate_stream(self, prompt: str, system: str = "") -> Iterator[str]:
+        """Generate a response from the LLM, yielding text as it is decoded."""
+        if not self.is_available():
+            return
+        payload = {
+            "model": self.model,
+            "prompt": prompt,
+            "stream": True,
+            "keep_alive": self.keep_alive,
+        }
+        if system:
+            payload["system"] = system
+
+        finished = False
+        try:
+            resp = self._post("/api/generate", payload)
+            # Ollama streams one JSON object per line until "done" is true.
+            for line in resp:
+                if not line.strip():
+                    continue
+                chunk = json.loads(line)
+                text = chunk.get("response", "")
+                if text:
+                    yield text
+                if chunk.get("done"):
+                    resp.read()
+                    finished = True
+                    break
+        except Exception as e:
+            logger.error(f"LLM stream error: {e}")
+            self._mark_unavailable()
+        finally:
+            # A partially read response leaves the connection unusable.
+            if not finished:
+                self.close()
+
+    def _feedback_prompt(self, verdict: str, question: str, expected: str,
+                         missing_concepts: Optional[list] = None) -> str:
         missing_str = ""
         if missing_concepts:
             missing_str = f"Missing concepts: {', '.join(missing_concepts)}."
 
-        prompt = (
+        return (
             f"You are an encouraging AI tutor. The student answered a question.\n"
             f"Question: {question}\n"
             f"Expected answer: {expected}\n"
@@ -77,7 +168,17 @@ class LLMCore:
             f"{missing_str}\n"
             f"Generate brief (2-3 sentence), encouraging feedback appropriate for the verdict."
         )
-        return self.generate(prompt)
+
+    def generate_feedback(self, verdict: str, question: str, expected: str,
+                          missing_concepts: Optional[list] = None) -> str:
+        """Generate tutor feedback using the LLM."""
+        return self.generate(self._feedback_prompt(verdict, question, expected, missing_concepts))
+
+    def generate_feedback_stream(self, verdict: str, question: str, expected: str,
+                                 missing_concepts: Optional[list] = None) -> Iterator[str]:
+        """Stream tutor feedback from the LLM as it is generated."""
+        return self.generate_stream(
+            self._feedback_prompt(verdict, question, expected, missing_concepts))
 
     def generate_explanation(self, question: str, expected: str) -> str:
         """Generate a detailed explanation."""
@@ -0,0 +1,64 @@
+"""ONNX Embedder: Sentence embeddings via onnxruntime, without torch."""
+
+import logging
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+ONNX_MODEL_FILE = "model_quantized.onnx"
+TOKENIZER_FILE = "tokenizer.json"
+MAX_SEQ_LENGTH = 256
+
+
+class OnnxEmbedder:
+    """
+    Drop-in replacement for the subset of ``SentenceTransformer.encode`` used by
+    the evaluator, backed by an int8 ONNX export of all-MiniLM-L6-v2
+    (see ``scripts/export_minilm_onnx.py``).
+    """
+
+    def __init__(self, model_dir: str):
+        import onnxruntime as ort
+        from tokenizers import Tokenizer
+
+        model_dir = Path(model_dir)
+        self._session = ort.InferenceSession(
+            str(model_dir / ONNX_MODEL_FILE), providers=["CPUExecutionProvider"]
+        )
+        self._input_names = {i.name for i in self._session.get_inputs()}
+        self._tokenizer = Tokenizer.from_file(str(model_dir / TOKENIZER_FILE))
+        self._tokenizer.enable_truncation(MAX_SEQ_LENGTH)
+        self._tokenizer.enable_padding()
+
+    @staticmethod
+    def is_available(model_dir: str) -> bool:
+        """Return True if an exported model exists in *model_dir*."""
+        model_dir = Path(model_dir)
+        return (model_dir / ONNX_MODEL_FILE).exists() and (model_dir / TOKENIZER_FILE).exists()
+
+    def encode(self, sentences, batch_size: int = 32, convert_to_numpy: bool = True,
+               normalize_embeddings: bool = False, **kwargs):
+        """Embed a sentence or list of sentences with mean pooling."""
+        import numpy as np
+
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else list(sentences)
+        chunks = []
+        for i in range(0, len(texts), batch_size):
+            encodings = self._tokenizer.encode_batch(texts[i:i + batch_size])
+            input_ids = np.array([e.ids for e in encodings], dtype=np.int64)
+            attention_mask = np.array([e.attention_mask for e in encodings], dtype=np.int64)
+            feeds = {"input_ids": input_ids, "attention_mask": attention_mask}
+            if "token_type_ids" in self._input_names:
+                feeds["token_type_ids"] = np.array([e.type_ids for e in encodings], dtype=np.int64)
+            hidden = self._session.run(None, feeds)[0]
+
+            mask = attention_mask[:, :, None].astype(np.float32)
+            pooled = (hidden * mask).sum(axis=1) / np.maximum(mask.sum(axis=1), 1e-9)
+            chunks.append(pooled.astype(np.float32))
+
+        embeddings = np.concatenate(chunks) if chunks else np.zeros((0, 0), dtype=np.float32)
+        if normalize_embeddings and len(embeddings):
+            norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+            embeddings = embeddings / np.maximum(norms, 1e-12)
+        return embeddings[0] if single else embeddings
@@ -1,11 +1,27 @@
 """Quiz Engine: Loads and manages question banks."""
 
 import json
+import os
 import random
 import time
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+@lru_cache(maxsize=8)
+def _load_question_bank(path: str, mtime_ns: int) -> list:
+    """Parse a question bank; cached per (path, mtime) so reloads are free."""
+    if orjson is not None:
+        return orjson.loads(Path(path).read_bytes())
+    with open(path, "r") as f:
+        return json.load(f)
+
 
 class QuizEngine:
     """Manages quiz questions from a JSON question bank."""
@@ -16,25 +32,31 @@ class QuizEngine:
         self.mode = mode
         self.difficulty_filter = difficulty_filter
         self.time_limit = time_limit
+        # Filter once; random mode shuffles an index order rather than copying
+        # and reshuffling the question list on every reset.
         self._filtered_questions = self._apply_filters()
+        self._order = list(range(len(self._filtered_questions)))
+        self._shuffle_order()
         self._index = 0
         self._question_start_time: Optional[float] = None
 
     def _load_questions(self, path: str) -> list:
-        with open(path, "r") as f:
-            return json.load(f)
+        path = os.path.abspath(path)
+        # Shallow copy so callers can't reorder the cached list.
+        return list(_load_question_bank(path, os.stat(path).st_mtime_ns))
 
     def _apply_filters(self) -> list:
         questions = self.questions
         if self.difficulty_filter:
             questions = [q for q in questions if q.get("difficulty") == self.difficulty_filter]
-        if self.mode == "random":
-            questions = questions[:]
-            random.shuffle(questions)
         return questions
 
+    def _shuffle_order(self):
+        if self.mode == "random":
+            random.shuffle(self._order)
+
     def reset(self):
-        self._filtered_questions = self._apply_filters()
+        self._shuffle_order()
         self._index = 0
 
     def has_next(self) -> bool:
@@ -43,20 +65,20 @@ class QuizEngine:
     def next_question(self) -> Optional[dict]:
         if not self.has_next():
             return None
-        q = self._filtered_questions[self._index]
+        q = self._filtered_questions[self._order[self._index]]
         self._index += 1
-        self._question_start_time = time.time()
+        self._question_start_time = time.monotonic()
         return q
 
     def is_timed_out(self) -> bool:
         if self.time_limit is None or self._question_start_time is None:
             return False
-        return (time.time() - self._question_start_time) > self.time_limit
+        return (time.monotonic() - self._question_start_time) > self.time_limit
 
     def get_elapsed_time(self) -> Optional[float]:
         if self._question_start_time is None:
             return None
-        return time.time() - self._question_start_time
+        return time.monotonic() - self._question_start_time
 
     def get_question_count(self) -> int:
         return len(self._filtered_questions)
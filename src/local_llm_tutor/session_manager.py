@@ -1,30 +1,128 @@
 """Session Manager: Tracks user performance and stores history in SQLite."""
 
+import array
+import queue
 import sqlite3
 import json
+import threading
 import time
 import uuid
 import logging
+from collections import Counter
 from pathlib import Path
 from typing import Optional, List, Dict
 
 logger = logging.getLogger(__name__)
 
+INSERT_RESULT_SQL = """
+    INSERT INTO question_results
+    (session_id, question_id, question, user_answer, verdict, score,
+     response_time, timestamp)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+INSERT_SESSION_SQL = """
+    INSERT OR REPLACE INTO sessions
+    (session_id, start_time, end_time, total_questions, correct,
+     partial, incorrect, avg_score)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+_VERDICT_TO_INT = {"correct": 0, "partial": 1, "incorrect": 2}
+
+# Queued after the last row to tell the writer thread to exit.
+_STOP = object()
+
+
+def _drain_results(q: "queue.Queue", conn, cursor, batch_size: int, idle_timeout: float):
+    """Writer thread: commit queued rows in batches until _STOP arrives."""
+    while True:
+        batch = [q.get()]
+        while len(batch) < batch_size and batch[-1] is not _STOP:
+            try:
+                batch.append(q.get(timeout=idle_timeout))
+            except queue.Empty:
+                break
+        stop = batch[-1] is _STOP
+        if stop:
+            batch.pop()
+        if batch:
+            _write_batch(conn, cursor, batch)
+        if stop:
+            return
+
+
+def _write_batch(conn, cursor, rows: List[tuple]):
+    try:
+        cursor.execute("BEGIN")
+        cursor.executemany(INSERT_RESULT_SQL, rows)
+        cursor.execute("COMMIT")
+    except Exception as e:
+        if conn.in_transaction:
+            cursor.execute("ROLLBACK")
+        logger.error(f"Failed to save results: {e}")
+
 
 class SessionManager:
-    """Manages quiz sessions and persists performance data to SQLite."""
+    """Manages quiz sessions and persists performance data to SQLite.
+
+    Call close() (or use the manager as a context manager) to guarantee that
+    every result reaches disk; __del__ flushes too, but only if the manager
+    is collected before interpreter shutdown stops the daemon writer thread.
+    """
+
+    # Question results are written by a background thread so record_answer()
+    # never waits on disk.  It commits up to FLUSH_THRESHOLD rows per
+    # transaction, or whatever arrived within WRITER_IDLE_TIMEOUT seconds.
+    FLUSH_THRESHOLD = 64
+    WRITER_IDLE_TIMEOUT = 0.05
+    # Topics whose mean score falls below this are reported as weak.
+    WEAK_TOPIC_THRESHOLD = 0.6
 
     def __init__(self, db_path: str = "tutor_sessions.db"):
         self.db_path = db_path
         self.session_id = str(uuid.uuid4())
         self.session_start = time.time()
-        self._results: List[Dict] = []
+        # History is stored column-wise: numeric fields in contiguous arrays,
+        # strings in plain lists, verdicts and topics as small integer codes.
+        self._scores = array.array("d")
+        self._times = array.array("d")
+        self._timestamps = array.array("d")
+        self._verdicts = array.array("b")
+        self._topic_ids = array.array("q")
+        self._question_ids: List[Optional[int]] = []
+        self._questions: List[str] = []
+        self._user_answers: List[str] = []
+        self._verdict_codes = dict(_VERDICT_TO_INT)
+        self._verdict_names = list(_VERDICT_TO_INT)
+        self._topic_codes: Dict[str, int] = {}
+        self._topic_names: List[str] = []
+        self._write_q: "queue.Queue" = queue.Queue()
+        self._writer: Optional[threading.Thread] = None
+        # Running totals so get_stats() is O(1) regardless of session length.
+        self._verdict_counts: Counter = Counter()
+        self._score_sum = 0.0
+        self._time_sum = 0.0
+        # Autocommit mode: transactions are opened explicitly around batches.
+        # The statement cache keeps INSERT_RESULT_SQL and the session upsert
+        # prepared for the life of the connection; one cursor is reused.
+        self._conn = sqlite3.connect(self.db_path, isolation_level=None,
+                                     check_same_thread=False,
+                                     cached_statements=128)
+        self._cursor = self._conn.cursor()
         self._init_db()
 
     def _init_db(self):
         """Initialize the SQLite database."""
-        conn = sqlite3.connect(self.db_path)
-        c = conn.cursor()
+        c = self._cursor
+        # WAL turns each commit into a single append and lets readers run
+        # alongside the writer; NORMAL sync is durable across app crashes.
+        if self.db_path != ":memory:":
+            c.execute("PRAGMA journal_mode=WAL")
+        c.execute("PRAGMA synchronous=NORMAL")
+        c.execute("PRAGMA temp_store=MEMORY")
+        c.execute("PRAGMA cache_size=-20000")  # ~20 MB page cache
+        c.execute("PRAGMA mmap_size=268435456")  # 256 MB
         c.execute("""
             CREATE TABLE IF NOT EXISTS sessions (
                 session_id TEXT PRIMARY KEY,
@@ -51,93 +149,153 @@ class SessionManager:
                 FOREIGN KEY (session_id) REFERENCES sessions(session_id)
             )
         """)
-        conn.commit()
-        conn.close()
         logger.info(f"Session DB initialized at {self.db_path}")
 
     def record_answer(self, question: dict, user_answer: str,
                       evaluation_result, response_time: float):
         """Record a single question result."""
-        result = {
-            "session_id": self.session_id,
-            "question_id": question.get("question_id"),
-            "question": question.get("question", ""),
-            "user_answer": user_answer,
-            "verdict": evaluation_result.verdict,
-            "score": evaluation_result.score,
-            "response_time": response_time,
-            "timestamp": time.time(),
-        }
-        self._results.append(result)
-        self._save_result(result)
+        verdict = evaluation_result.verdict
+        score = evaluation_result.score
+        timestamp = time.time()
+        question_id = question.get("question_id")
+        question_text = question.get("question", "")
 
-    def _save_result(self, result: dict):
-        try:
-            conn = sqlite3.connect(self.db_path)
-            c = conn.cursor()
-            c.execute("""
-                INSERT INTO question_results
-                (session_id, question_id, question, user_answer, verdict, score,
-                 response_time, timestamp)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                result["session_id"], result["question_id"], result["question"],
-                result["user_answer"], result["verdict"], result["score"],
-                result["response_time"], result["timestamp"],
-            ))
-            conn.commit()
-            conn.close()
-        except Exception as e:
-            logger.error(f"Failed to save result: {e}")
+        verdict_code = self._verdict_codes.get(verdict)
+        if verdict_code is None:
+            verdict_code = self._verdict_codes[verdict] = len(self._verdict_names)
+            self._verdict_names.append(verdict)
+        topic = question.get("topic")
+        if topic:
+            topic_id = self._topic_codes.get(topic)
+            if topic_id is None:
+                topic_id = self._topic_codes[topic] = len(self._topic_names)
+                self._topic_names.append(topic)
+        else:
+            topic_id = -1
+
+        self._scores.append(score)
+        self._times.append(response_time)
+        self._timestamps.append(timestamp)
+        self._verdicts.append(verdict_code)
+        self._topic_ids.append(topic_id)
+        self._question_ids.append(question_id)
+        self._questions.append(question_text)
+        self._user_answers.append(user_answer)
+
+        self._verdict_counts[verdict] += 1
+        self._score_sum += score
+        self._time_sum += response_time
+        self._save_result((
+            self.session_id, question_id, question_text, user_answer,
+            verdict, score, response_time, timestamp,
+        ))
+
+    def _save_result(self, row: tuple):
+        if self._writer is None:
+            # The thread gets only the queue and connection, never self, so an
+            # unclosed manager can still be collected and flushed by __del__.
+            self._writer = threading.Thread(
+                target=_drain_results, name="session-writer", daemon=True,
+                args=(self._write_q, self._conn, self._cursor,
+                      self.FLUSH_THRESHOLD, self.WRITER_IDLE_TIMEOUT))
+            self._writer.start()
+        self._write_q.put(row)
+
+    def flush(self, timeout: Optional[float] = None):
+        """Block until every recorded result has been written.
+
+        Stops the writer thread; the next record_answer() starts a new one.
+        """
+        writer, self._writer = self._writer, None
+        if writer is None:
+            return
+        self._write_q.put(_STOP)
+        writer.join(timeout)
+        if writer.is_alive():
+            logger.warning("Session writer did not finish in time; results may be lost.")
 
     def get_stats(self) -> dict:
         """Get current session statistics."""
-        total = len(self._results)
-        correct = sum(1 for r in self._results if r["verdict"] == "correct")
-        partial = sum(1 for r in self._results if r["verdict"] == "partial")
-        incorrect = sum(1 for r in self._results if r["verdict"] == "incorrect")
-        avg_score = sum(r["score"] for r in self._results) / total if total > 0 else 0.0
-        avg_time = sum(r["response_time"] for r in self._results) / total if total > 0 else 0.0
-
+        total = len(self._scores)
         return {
             "session_id": self.session_id,
             "total_questions": total,
-            "correct": correct,
-            "partial": partial,
-            "incorrect": incorrect,
-            "avg_score": avg_score,
-            "avg_response_time": avg_time,
+            "correct": self._verdict_counts["correct"],
+            "partial": self._verdict_counts["partial"],
+            "incorrect": self._verdict_counts["incorrect"],
+            "avg_score": self._score_sum / total if total > 0 else 0.0,
+            "avg_response_time": self._time_sum / total if total > 0 else 0.0,
         }
 
     def finalize_session(self):
         """Save session summary to DB."""
         stats = self.get_stats()
+        self.flush()
         try:
-            conn = sqlite3.connect(self.db_path)
-            c = conn.cursor()
-            c.execute("""
-                INSERT OR REPLACE INTO sessions
-                (session_id, start_time, end_time, total_questions, correct,
-                 partial, incorrect, avg_score)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
+            self._cursor.execute(INSERT_SESSION_SQL, (
                 self.session_id, self.session_start, time.time(),
                 stats["total_questions"], stats["correct"], stats["partial"],
                 stats["incorrect"], stats["avg_score"],
             ))
-            conn.commit()
-            conn.close()
         except Exception as e:
             logger.error(f"Failed to finalize session: {e}")
 
-    def get_weak_topics(self) -> List[str]:
-        """Return topics where user performed poorly."""
-        topic_scores: Dict[str, List[float]] = {}
-        for r in self._results:
-            # We'd need topic info - for now return empty
+    def close(self):
+        """Flush pending results and close the database connection."""
+        if self._conn is None:
+            return
+        self.flush()
+        self._cursor.close()
+        self._conn.close()
+        self._cursor = None
+        self._conn = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+    def __del__(self):
+        try:
+            # Bounded wait: at interpreter shutdown the writer may be frozen.
+            self.flush(timeout=1.0)
+            self.close()
+        except Exception:
             pass
-        return []
+
+    def get_weak_topics(self) -> List[str]:
+        """Return topics where user performed poorly, weakest first."""
+        if not self._topic_names:
+            return []
+        import numpy as np
+        topic_ids = np.frombuffer(self._topic_ids, dtype=np.int64)
+        scores = np.frombuffer(self._scores, dtype=np.float64)
+        known = topic_ids >= 0
+        topic_ids, scores = topic_ids[known], scores[known]
+        n = len(self._topic_names)
+        counts = np.bincount(topic_ids, minlength=n)
+        mean_scores = np.bincount(topic_ids, weights=scores, minlength=n) / np.maximum(counts, 1)
+        weak = np.flatnonzero((counts > 0) & (mean_scores < self.WEAK_TOPIC_THRESHOLD))
+        return [self._topic_names[i] for i in weak[np.argsort(mean_scores[weak], kind="stable")]]
 
     def get_history(self) -> List[Dict]:
         """Return all results for this session."""
-        return list(self._results)
+        verdict_names = self._verdict_names
+        return [
+            {
+                "session_id": self.session_id,
+                "question_id": qid,
+                "question": question,
+                "user_answer": answer,
+                "verdict": verdict_names[verdict],
+                "score": score,
+                "response_time": response_time,
+                "timestamp": timestamp,
+            }
+            for qid, question, answer, verdict, score, response_time, timestamp in zip(
+                self._question_ids, self._questions, self._user_answers,
+                self._verdicts, self._scores, self._times, self._timestamps,
+            )
+        ]
@@ -3,8 +3,11 @@
 import logging
 import tempfile
 import os
-from typing import Optional, Tuple
-import numpy as np
+from functools import lru_cache
+from typing import TYPE_CHECKING, Iterator, Optional, Tuple
+
+if TYPE_CHECKING:
+    import numpy as np
 
 logger = logging.getLogger(__name__)
 
@@ -12,6 +15,34 @@ SAMPLE_RATE = 16000
 CHANNELS = 1
 
 
+@lru_cache(maxsize=4)
+def _load_faster_whisper(model_size: str, device: str = "cpu", compute_type: str = "int8"):
+    """Load a faster-whisper model once per process and configuration."""
+    from faster_whisper import WhisperModel
+    return WhisperModel(model_size, device=device, compute_type=compute_type)
+
+
+@lru_cache(maxsize=4)
+def _load_openai_whisper(model_size: str):
+    """Load an openai-whisper model once per process."""
+    import whisper
+    return whisper.load_model(model_size)
+
+
+def clear_model_cache():
+    """Drop cached Whisper models (e.g. between tests)."""
+    _load_faster_whisper.cache_clear()
+    _load_openai_whisper.cache_clear()
+
+
+def _to_pcm16(audio: "np.ndarray") -> "np.ndarray":
+    """Convert float audio in [-1, 1] to int16 PCM with a single float32 scratch array."""
+    import numpy as np
+    pcm = np.multiply(audio, 32767, dtype=np.float32)
+    np.clip(pcm, -32768, 32767, out=pcm)
+    return pcm.astype(np.int16)
+
+
 class STTResult:
     """Result from speech-to-text transcription."""
 
@@ -33,37 +64,79 @@ class STTModule:
         self.language = language
         self.energy_threshold = energy_threshold
         self._model = None
+        # Which library produced self._model, recorded at load time so the
+        # transcription path never re-imports backends to type-check it.
+        self._backend: Optional[str] = None
 
     def _get_model(self):
         """Lazy-load Whisper model."""
         if self._model is None:
             try:
-                from faster_whisper import WhisperModel
-                self._model = WhisperModel(self.model_size, device="cpu", compute_type="int8")
+                self._model = _load_faster_whisper(self.model_size)
+                self._backend = "faster_whisper"
                 logger.info(f"Loaded faster-whisper model: {self.model_size}")
             except ImportError:
                 try:
-                    import whisper
-                    self._model = whisper.load_model(self.model_size)
+                    self._model = _load_openai_whisper(self.model_size)
+                    self._backend = "openai_whisper"
                     logger.info(f"Loaded openai-whisper model: {self.model_size}")
                 except ImportError:
                     logger.warning("No Whisper library available.")
                     self._model = "unavailable"
         return self._model
 
-    def transcribe_audio(self, audio_data: np.ndarray) -> STTResult:
+    def warm_up(self):
+        """Load the Whisper model ahead of the first transcription."""
+        self._get_model()
+
+    def transcribe_audio(self, audio_data: "np.ndarray") -> STTResult:
         """Transcribe audio numpy array to text."""
         model = self._get_model()
         if model == "unavailable":
             return STTResult("", 0.0)
 
-        # Write to temp file
+        # faster-whisper takes a float32 array directly, no WAV round-trip.
+        if self._backend == "faster_whisper":
+            try:
+                return self._transcribe_array(audio_data)
+            except Exception as e:
+                logger.error(f"STT transcription error: {e}")
+                return STTResult("", 0.0)
+
+        return self._transcribe_via_wav(audio_data)
+
+    def transcribe_stream(self, audio_data: "np.ndarray") -> Iterator[str]:
+        """Yield transcript segments as they are decoded.
+
+        faster-whisper decodes lazily, so a caller that stops iterating early
+        (e.g. on a "skip" command) also stops decoding.  Other backends yield
+        the whole transcript as a single segment.
+        """
+        model = self._get_model()
+        if model == "unavailable":
+            return
+        if self._backend != "faster_whisper":
+            result = self._transcribe_via_wav(audio_data)
+            if result:
+                yield result.text
+            return
+        import numpy as np
+        try:
+            segments, _ = model.transcribe(
+                np.asarray(audio_data, dtype=np.float32), language=self.language)
+            for seg in segments:
+                yield seg.text
+        except Exception as e:
+            logger.error(f"STT transcription error: {e}")
+
+    def _transcribe_via_wav(self, audio_data: "np.ndarray") -> STTResult:
+        """Transcribe through a temporary WAV file (openai-whisper needs a path)."""
         with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as f:
             tmp_path = f.name
 
         try:
             import scipy.io.wavfile as wav
-            wav.write(tmp_path, SAMPLE_RATE, (audio_data * 32767).astype(np.int16))
+            wav.write(tmp_path, SAMPLE_RATE, _to_pcm16(audio_data))
             return self._transcribe_file(tmp_path)
         except Exception as e:
             logger.error(f"STT transcription error: {e}")
@@ -72,22 +145,22 @@ class STTModule:
             if os.path.exists(tmp_path):
                 os.unlink(tmp_path)
 
+    def _transcribe_array(self, audio: "np.ndarray") -> STTResult:
+        """Transcribe a 16 kHz float32 mono array with faster-whisper."""
+        import numpy as np
+        segments, info = self._get_model().transcribe(
+            np.asarray(audio, dtype=np.float32), language=self.language)
+        text = " ".join(seg.text for seg in segments).strip()
+        return STTResult(text, 0.8, info.language)
+
     def _transcribe_file(self, audio_path: str) -> STTResult:
-        """Transcribe an audio file."""
-        model = self._get_model()
-        try:
-            from faster_whisper import WhisperModel
-            if isinstance(model, WhisperModel):
-                segments, info = model.transcribe(audio_path, language=self.language)
-                text = " ".join(seg.text for seg in segments).strip()
-                # Use avg_logprob as proxy for confidence
-                confidence = 0.8  # Default
-                return STTResult(text, confidence, info.language)
-        except ImportError:
-            pass
+        """Transcribe an audio file with openai-whisper.
 
+        faster-whisper never comes through here; it decodes the array directly
+        (see _transcribe_array).
+        """
+        model = self._get_model()
         try:
-            import whisper
             result = model.transcribe(audio_path, language=self.language)
             text = result.get("text", "").strip()
             return STTResult(text, 0.8, self.language)
@@ -95,8 +168,9 @@ class STTModule:
             logger.error(f"Whisper transcription error: {e}")
             return STTResult("", 0.0)
 
-    def record_audio(self, duration: float = 5.0, sample_rate: int = SAMPLE_RATE) -> np.ndarray:
+    def record_audio(self, duration: float = 5.0, sample_rate: int = SAMPLE_RATE) -> "np.ndarray":
         """Record audio from microphone."""
+        import numpy as np
         try:
             import sounddevice as sd
             logger.info(f"Recording audio for {duration} seconds...")
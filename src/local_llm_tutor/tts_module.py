@@ -7,17 +7,26 @@ from typing import Optional
 
 logger = logging.getLogger(__name__)
 
+# Split after sentence-ending punctuation followed by whitespace.
+_SENTENCE_END_RE = re.compile(r"(?<=[.!?])\s+")
+
 
 class TTSModule:
     """Handles text-to-speech conversion using pyttsx3."""
 
     def __init__(self, rate: int = 150, volume: float = 1.0, voice_index: int = 0,
-                 voice_gender: Optional[str] = None):
+                 voice_gender: Optional[str] = None, reinit_per_utterance: bool = False):
         self.rate = rate
         self.volume = volume
         self.voice_index = voice_index
         self.voice_gender = voice_gender
+        # The engine is kept alive across utterances and only rebuilt when it
+        # fails.  Set reinit_per_utterance on platforms where pyttsx3's event
+        # loop silently fails to restart after the first utterance.
+        self.reinit_per_utterance = reinit_per_utterance
         self._engine = None
+        # (casefolded gender, compiled pattern), rebuilt only if voice_gender changes
+        self._gender_re = None
         self._speaking = False
         self._lock = threading.Lock()
         self._init_engine()
@@ -30,17 +39,14 @@ class TTSModule:
         back to the index-based selection when no gender match is found.
         """
         if self.voice_gender:
-            gender = self.voice_gender.lower()
+            gender = self.voice_gender.casefold()
+            gender_re = self._gender_pattern(gender)
             for v in voices:
                 v_gender = getattr(v, "gender", None)
-                if v_gender and v_gender.lower() == gender:
+                if v_gender and v_gender.casefold() == gender:
                     return v
-                name = (v.name or "").lower()
-                vid = (v.id or "").lower()
-                # Use word-boundary matching to avoid false positives
-                # (e.g., "female" must not match "shemale").
-                if re.search(r'\b' + re.escape(gender) + r'\b', name) or \
-                        re.search(r'\b' + re.escape(gender) + r'\b', vid):
+                if gender_re.search((v.name or "").casefold()) or \
+                        gender_re.search((v.id or "").casefold()):
                     return v
         if self.voice_index < len(voices):
             return voices[self.voice_index]
@@ -50,6 +56,16 @@ class TTSModule:
         )
         return voices[0]
 
+    def _gender_pattern(self, gender: str):
+        """Return the word-boundary pattern for *gender*, compiled once per value."""
+        cached = self._gender_re
+        if cached is None or cached[0] != gender:
+            # Use word-boundary matching to avoid false positives
+            # (e.g., "female" must not match "shemale").
+            cached = (gender, re.compile(r'\b' + re.escape(gender) + r'\b'))
+            self._gender_re = cached
+        return cached[1]
+
     def _init_engine(self):
         try:
             import pyttsx3
@@ -72,28 +88,62 @@ class TTSModule:
         with self._lock:
             self._speaking = True
             try:
-                # Reinitialize engine on each call to avoid pyttsx3 reuse issues
-                # where the event loop fails to restart after the first utterance.
-                self._init_engine()
+                if self._engine is None or self.reinit_per_utterance:
+                    self._reset_engine()
                 if self._engine is None:
                     print(f"[TTS] {text}")
                     return
-                self._engine.say(text)
-                if blocking:
-                    self._engine.runAndWait()
+                try:
+                    self._say(text, blocking)
+                except RuntimeError as e:
+                    # e.g. "run loop already started": rebuild once and retry.
+                    logger.warning(f"TTS engine error ({e}); reinitializing.")
+                    self._reset_engine()
+                    if self._engine is None:
+                        print(f"[TTS] {text}")
+                        return
+                    self._say(text, blocking)
             except Exception as e:
                 logger.error(f"TTS speak error: {e}")
                 print(f"[TTS] {text}")
             finally:
-                # Release the engine reference so that pyttsx3's internal
-                # WeakValueDictionary drops the stale instance.  The next
-                # speak() call then gets a truly fresh engine via pyttsx3.init().
                 # We intentionally do NOT call stop() here: stop() interrupts
                 # any audio still buffered in the OS layer, which causes longer
                 # explanations to be cut off even after runAndWait() returns.
-                self._engine = None
+                if self.reinit_per_utterance:
+                    self._engine = None
                 self._speaking = False
 
+    def _say(self, text: str, blocking: bool):
+        self._engine.say(text)
+        if blocking:
+            self._engine.runAndWait()
+
+    def _reset_engine(self):
+        """Build a fresh engine.
+
+        The old reference is released first so that pyttsx3's internal
+        WeakValueDictionary drops the stale instance and pyttsx3.init()
+        returns a truly new engine.
+        """
+        self._engine = None
+        self._init_engine()
+
+    def speak_stream(self, chunks):
+        """Speak incrementally produced text one sentence at a time.
+
+        Chunks (e.g. streamed LLM tokens) are buffered until a sentence
+        boundary, so speech starts before the full text is available.
+        """
+        buffer = ""
+        for chunk in chunks:
+            buffer += chunk
+            *sentences, buffer = _SENTENCE_END_RE.split(buffer)
+            for sentence in sentences:
+                self.speak(sentence)
+        if buffer.strip():
+            self.speak(buffer.strip())
+
     def stop(self):
         """Stop current speech."""
         if self._engine and self._speaking:
@@ -1,18 +1,62 @@
 """Main Tutor Orchestrator: Coordinates all modules for the full interaction loop."""
 
 import logging
+import re
 import time
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Optional
 
 logger = logging.getLogger(__name__)
 
+# One scan for every command keyword; the group name is the command.  When an
+# utterance contains keywords for several commands, the first one listed in
+# _COMMAND_PRIORITY wins, so "repeat" beats "explain", "skip" and "quit".
+_COMMAND_SCAN_RE = re.compile(
+    r"(?P<repeat>repeat|say again)"
+    r"|(?P<explain>explain|give example)"
+    r"|(?P<skip>skip|next|pass)"
+    r"|(?P<quit>quit|exit|stop)"
+)
+_COMMAND_PRIORITY = ("repeat", "explain", "skip", "quit")
+
+# Most command utterances are just the keyword, maybe padded by STT noise
+# ("Next.", " quit please "), so those are resolved with one anchored match
+# before falling back to the priority scan above.
+_BARE_COMMAND_RE = re.compile(
+    r"\s*(repeat|say again|explain|give example|skip|next|pass|quit|exit|stop)"
+    r"(?:\s+please)?[\s.!?,]*",
+    re.IGNORECASE,
+)
+_CANONICAL = {
+    "repeat": "repeat", "say again": "repeat",
+    "explain": "explain", "give example": "explain",
+    "skip": "skip", "next": "skip", "pass": "skip",
+    "quit": "quit", "exit": "quit", "stop": "quit",
+}
+
+# Whisper often transcribes silence as "...", "…" or " .", which is no answer.
+# \w is Unicode-aware, unlike a string.punctuation translate table.
+_WORD_RE = re.compile(r"\w")
+
+
+def _match_command(text: str) -> Optional[str]:
+    """Return the command named in *text*, or None."""
+    m = _BARE_COMMAND_RE.fullmatch(text)
+    if m:
+        return _CANONICAL[m.group(1).casefold()]
+    found = {m.lastgroup for m in _COMMAND_SCAN_RE.finditer(text.casefold())}
+    if not found:
+        return None
+    return next(c for c in _COMMAND_PRIORITY if c in found)
+
 
 class Tutor:
     """
     Main AI Tutor class that orchestrates the full quiz interaction loop.
     Coordinates TTS, STT, Quiz Engine, Evaluation, Feedback, and Session Management.
+    TTS and STT are only used in voice mode and may be None when text_only is set.
     """
 
     def __init__(
@@ -37,6 +81,7 @@ class Tutor:
         self.llm = llm_core
         self.text_only = text_only
         self._running = False
+        self._executor: Optional[ThreadPoolExecutor] = None
 
     def speak(self, text: str):
         """Output text via TTS or print if text-only mode."""
@@ -44,6 +89,44 @@ class Tutor:
         if not self.text_only:
             self.tts.speak(text)
 
+    def speak_while_warming_up(self, text: str):
+        """Speak *text* while the STT model and audio stack load in parallel.
+
+        Speech stays on the calling thread, which owns the TTS engine (the
+        SAPI5 and NSSpeechSynthesizer drivers cannot be driven from another
+        thread); only the warm-up runs on the executor.  Blocks until both
+        are done, so the microphone never records the tutor's own voice.
+        """
+        print(f"\n[Tutor]: {text}")
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="warmup")
+        warm_up = self._executor.submit(self._warm_up_audio)
+        self.tts.speak(text, True)
+        warm_up.result()
+
+    def _warm_up_audio(self):
+        try:
+            self.stt.warm_up()
+            if self.audio:
+                self.audio.warm_up()
+        except Exception as e:
+            logger.debug(f"Audio warm-up failed: {e}")
+
+    def speak_stream(self, chunks) -> str:
+        """Print and speak incrementally produced text; returns the full text."""
+        parts = []
+        print("\n[Tutor]: ", end="", flush=True)
+
+        def tee():
+            for chunk in chunks:
+                print(chunk, end="", flush=True)
+                parts.append(chunk)
+                yield chunk
+
+        self.tts.speak_stream(tee())
+        print()
+        return "".join(parts)
+
     def listen(self) -> str:
         """Get user input via STT or keyboard if text-only mode."""
         if self.text_only:
@@ -56,22 +139,40 @@ class Tutor:
         print("\n[Listening... speak your answer]")
         if self.audio:
             audio_data = self.audio.record_with_vad()
-            result = self.stt.transcribe_audio(audio_data)
+            text = self._transcribe_streaming(audio_data)
+            if text:
+                logger.info(f"STT: '{text}'")
         else:
             result = self.stt.listen_and_transcribe()
+            text = result.text
+            if text:
+                logger.info(f"STT: '{text}' (confidence: {result.confidence:.2f})")
 
-        if result.text:
-            print(f"\n[Transcribed]: {result.text}")
-            logger.info(f"STT: '{result.text}' (confidence: {result.confidence:.2f})")
-        return result.text
+        if text:
+            print(f"\n[Transcribed]: {text}")
+        return text
+
+    def _transcribe_streaming(self, audio_data) -> str:
+        """Collect streamed STT segments, stopping decoding early on a bare skip."""
+        segments = []
+        for segment in self.stt.transcribe_stream(audio_data):
+            segments.append(segment)
+            # Only an opening segment that is nothing but a skip ends decoding.
+            # Quit is never cut short: ending the session on "Stop." when an
+            # undecoded "Can you repeat that?" follows is far costlier than
+            # decoding the rest.
+            m = None if len(segments) > 1 else _BARE_COMMAND_RE.fullmatch(segment)
+            if m and _CANONICAL[m.group(1).casefold()] == "skip":
+                break
+        return " ".join(segments).strip()
 
     def handle_special_commands(self, text: str, question: dict) -> Optional[str]:
         """Handle special voice commands like 'repeat', 'explain more', etc."""
-        lower = text.lower().strip()
-        if any(cmd in lower for cmd in ["repeat", "repeat the question", "say again"]):
+        command = _match_command(text)
+        if command == "repeat":
             self.speak(f"Repeating: {question.get('question', '')}")
             return "repeat"
-        if any(cmd in lower for cmd in ["explain more", "explain", "give example"]):
+        if command == "explain":
             if self.llm and self.llm.is_available():
                 explanation = self.llm.generate_explanation(
                     question.get("question", ""),
@@ -82,27 +183,26 @@ class Tutor:
                     return "explained"
             self.speak(f"The answer to this question involves: {question.get('expected_answer', '')}")
             return "explained"
-        if any(cmd in lower for cmd in ["skip", "next", "pass"]):
-            return "skip"
-        if any(cmd in lower for cmd in ["quit", "exit", "stop"]):
-            return "quit"
-        return None
+        return command
 
     def run_question(self, question: dict, question_num: int, total: int) -> bool:
         """Run a single question interaction. Returns False if session should end."""
         intro = self.feedback.generate_intro(question, question_num, total)
-        self.speak(intro)
+        if self.text_only:
+            self.speak(intro)
+        else:
+            self.speak_while_warming_up(intro)
 
-        start_time = time.time()
+        start_time = time.monotonic()
         max_retries = 2
         empty_attempts = 0
         max_interactions = 20  # safety cap to prevent infinite loops
 
         for _ in range(max_interactions):
             user_answer = self.listen()
-            response_time = time.time() - start_time
+            response_time = time.monotonic() - start_time
 
-            if not user_answer:
+            if not user_answer or not _WORD_RE.search(user_answer):
                 if empty_attempts < max_retries:
                     empty_attempts += 1
                     self.speak("I didn't catch that. Please try again.")
@@ -130,9 +230,12 @@ class Tutor:
             # Record result
             self.session.record_answer(question, user_answer, result, response_time)
 
-            # Generate and speak feedback
-            feedback_text = self.feedback.generate(result, question)
-            self.speak(feedback_text)
+            # Generate and speak feedback; in voice mode, stream it so speech
+            # starts while the LLM is still generating.
+            if self.text_only:
+                self.speak(self.feedback.generate(result, question))
+            else:
+                self.speak_stream(self.feedback.generate_stream(result, question))
 
             # Log scores
             print(f"  [Score: {result.score:.0%} | Verdict: {result.verdict} | "
@@ -175,4 +278,7 @@ class Tutor:
 
         logger.info(f"Session complete: {stats}")
         self._running = False
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
         return stats
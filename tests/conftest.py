@@ -0,0 +1,35 @@
+"""Shared test data for the local_llm_tutor test suite."""
+from types import MappingProxyType
+
+from local_llm_tutor.evaluation_engine import EvaluationResult
+
+
+# Read-only so a test cannot leak changes into the others; derive variants
+# with dict(SAMPLE_QUESTION, key=value).
+SAMPLE_QUESTION = MappingProxyType({
+    "question_id": 1,
+    "question": "What is Python?",
+    "expected_answer": "Python is a high-level programming language.",
+    "key_concepts": ("high-level", "programming"),
+    "difficulty": "easy",
+})
+
+_NO_CONCEPTS = ()
+
+
+def make_eval_result(verdict="correct", score=0.9, semantic_score=0.9,
+                     concept_coverage=1.0, matched=None, missing=None):
+    """Factory for EvaluationResult test objects.
+
+    Concept lists default to one shared empty tuple rather than a fresh list
+    per call; nothing under test mutates them.
+    """
+    return EvaluationResult(
+        verdict=verdict,
+        score=score,
+        exact_match=verdict == "correct",
+        semantic_score=semantic_score,
+        concept_coverage=concept_coverage,
+        matched_concepts=matched or _NO_CONCEPTS,
+        missing_concepts=missing or _NO_CONCEPTS,
+    )
@@ -0,0 +1,106 @@
+"""Tests for the AudioController module."""
+import sys
+import time
+import types
+import numpy as np
+import pytest
+from local_llm_tutor.audio_controller import AudioController
+
+
+@pytest.fixture
+def controller():
+    return AudioController(energy_threshold=300.0)
+
+
+def test_compute_rms_silence(controller):
+    assert controller._compute_rms(np.zeros(1024, dtype=np.int16)) == 0.0
+
+
+def test_compute_rms_matches_float_reference(controller):
+    rng = np.random.default_rng(0)
+    data = rng.integers(-32768, 32767, size=1024, dtype=np.int16)
+    expected = float(np.sqrt(np.mean(data.astype(np.float64) ** 2)))
+    assert controller._compute_rms(data) == pytest.approx(expected)
+
+
+def test_compute_rms_full_scale_does_not_overflow(controller):
+    data = np.full(1024, -32768, dtype=np.int16)
+    assert controller._compute_rms(data) == pytest.approx(32768.0)
+
+
+class FakeInputStream:
+    """Stands in for sounddevice.InputStream, delivering canned int16 blocks."""
+
+    blocks = []
+
+    def __init__(self, samplerate, channels, dtype, blocksize, callback):
+        self._callback = callback
+
+    def __enter__(self):
+        for block in self.blocks:
+            self._callback(block.reshape(-1, 1), len(block), None, None)
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+@pytest.fixture
+def fake_sounddevice(monkeypatch):
+    module = types.SimpleNamespace(InputStream=FakeInputStream)
+    monkeypatch.setitem(sys.modules, "sounddevice", module)
+    return FakeInputStream
+
+
+def _block(value):
+    return np.full(1024, value, dtype=np.int16)
+
+
+def test_record_with_vad_trims_leading_silence_and_stops(controller, fake_sounddevice):
+    controller.silence_duration = 0.1  # ~1.6 blocks at 16 kHz
+    fake_sounddevice.blocks = [_block(0), _block(1000), _block(1000)] + [_block(0)] * 5
+    audio = controller.record_with_vad(max_duration=1.0)
+    assert audio.dtype == np.float32
+    # Two voiced blocks plus the quiet blocks up to the silence cutoff.
+    assert len(audio) == 1024 * 4
+    assert audio[0] == pytest.approx(1000 / 32767.0)
+
+
+def test_record_with_vad_logs_onset_rms(controller, fake_sounddevice, caplog):
+    controller.silence_duration = 0.1
+    fake_sounddevice.blocks = [_block(0), _block(1000)] + [_block(0)] * 3
+    with caplog.at_level("DEBUG", logger="local_llm_tutor.audio_controller"):
+        controller.record_with_vad(max_duration=1.0)
+    assert "Speech onset, block RMS 1000" in caplog.text
+
+
+def test_record_with_vad_no_speech_returns_placeholder(controller, fake_sounddevice):
+    fake_sounddevice.blocks = [_block(0)] * 4
+    audio = controller.record_with_vad(max_duration=1024 * 4 / 16000)
+    assert len(audio) == 1
+
+
+def test_record_with_vad_returns_when_stream_stalls(controller, fake_sounddevice):
+    """A stream that never invokes the callback must not hang the recording."""
+    fake_sounddevice.blocks = []
+    start = time.monotonic()
+    audio = controller.record_with_vad(max_duration=0.2)
+    assert time.monotonic() - start < 2.0
+    assert len(audio) == 1
+
+
+@pytest.mark.parametrize("compiled", [True, False])
+@pytest.mark.parametrize("value, expected", [(0, False), (299, False), (301, True), (-301, True)])
+def test_energy_above_threshold(controller, monkeypatch, compiled, value, expected):
+    if not compiled:
+        monkeypatch.setattr("local_llm_tutor.audio_controller._sum_squares", None)
+    assert controller._energy_above(np.full(1024, value, dtype=np.int16), 300.0) is expected
+
+
+def test_warm_up_compiles_energy_kernel(controller, monkeypatch):
+    calls = []
+    monkeypatch.setattr("local_llm_tutor.audio_controller._sum_squares",
+                        lambda buf: calls.append(buf) or 0)
+    controller.warm_up()
+    assert len(calls) == 1
+    assert calls[0].dtype == np.int16
@@ -93,3 +93,134 @@ def test_evaluation_result_to_dict(engine):
     assert "concept_coverage" in d
     assert "matched_concepts" in d
     assert "missing_concepts" in d
+
+
+class FakeEmbedder:
+    """Deterministic bag-of-letters embedder recording each encode call."""
+
+    def __init__(self):
+        self.calls = []
+
+    def encode(self, texts, convert_to_numpy=True, normalize_embeddings=False, **kwargs):
+        import numpy as np
+        single = isinstance(texts, str)
+        batch = [texts] if single else list(texts)
+        self.calls.append(batch)
+        out = np.zeros((len(batch), 26), dtype=np.float32)
+        for i, text in enumerate(batch):
+            for ch in text.lower():
+                if "a" <= ch <= "z":
+                    out[i, ord(ch) - ord("a")] += 1
+        if normalize_embeddings:
+            norms = np.linalg.norm(out, axis=1, keepdims=True)
+            out = out / np.where(norms == 0, 1, norms)
+        return out[0] if single else out
+
+
+def test_precompute_expected_batches_answers(engine):
+    embedder = FakeEmbedder()
+    with patch.object(engine, "_get_embedder", return_value=embedder):
+        engine.precompute_expected([SAMPLE_QUESTION, dict(SAMPLE_QUESTION, question_id=2)])
+        assert embedder.calls == [[SAMPLE_QUESTION["expected_answer"]]]
+        score = engine.compute_semantic_similarity(
+            SAMPLE_QUESTION["expected_answer"], SAMPLE_QUESTION["expected_answer"]
+        )
+    # Only the user answer is encoded at evaluation time.
+    assert len(embedder.calls) == 2
+    assert score == pytest.approx(1.0)
+
+
+def test_int8_similarity_close_to_float32():
+    answers = ["Python is a programming language", "A snake that lives in the jungle"]
+    exact = EvaluationEngine(quantize_embeddings=False)
+    quantized = EvaluationEngine(quantize_embeddings=True)
+    for eng in (exact, quantized):
+        eng._embedder = FakeEmbedder()
+    for answer in answers:
+        expected = SAMPLE_QUESTION["expected_answer"]
+        assert quantized.compute_semantic_similarity(answer, expected) == pytest.approx(
+            exact.compute_semantic_similarity(answer, expected), abs=0.02
+        )
+
+
+def test_int8_similarity_accurate_at_minilm_dimension():
+    """Per-vector scaling keeps 384-d dot products within quantization noise."""
+    import numpy as np
+    rng = np.random.default_rng(0)
+    vecs = rng.standard_normal((64, 384)).astype(np.float32)
+    vecs /= np.linalg.norm(vecs, axis=1, keepdims=True)
+    engine = EvaluationEngine(quantize_embeddings=True)
+    errors = [
+        abs(engine._embedding_similarity(u, engine._store_embedding(e)) - float(u @ e))
+        for u, e in zip(vecs[::2], vecs[1::2])
+    ]
+    assert max(errors) < 0.005
+
+
+def test_key_concept_detection_overlapping_concepts(engine):
+    matched, missing, _ = engine.detect_key_concepts(
+        "Machine learning learns from data science",
+        ["Machine Learning", "learning", "data", "data science", "science", "neural"]
+    )
+    assert matched == ["Machine Learning", "learning", "data", "data science", "science"]
+    assert missing == ["neural"]
+
+
+def test_encode_async_coalesces_requests(engine):
+    embedder = FakeEmbedder()
+    engine._embedder = embedder
+    futures = [engine.encode_async(text) for text in ("abc", "xyz", "abc")]
+    embeddings = [f.result(timeout=5) for f in futures]
+    engine.close()
+    assert len(embedder.calls) == 1
+    assert embeddings[0] @ embeddings[2] == pytest.approx(1.0)
+
+
+def test_concurrent_first_encode_async_loads_model_once(monkeypatch):
+    import sys
+    import threading
+    import time
+    import types
+    built = []
+
+    class SlowSentenceTransformer(FakeEmbedder):
+        def __init__(self, *args, **kwargs):
+            time.sleep(0.3)
+            super().__init__()
+            built.append(self)
+
+    monkeypatch.setitem(sys.modules, "sentence_transformers",
+                        types.SimpleNamespace(SentenceTransformer=SlowSentenceTransformer))
+    engine = EvaluationEngine(onnx_model_dir=None)
+    futures, batchers = [], []
+    barrier = threading.Barrier(8)
+
+    def first_call():
+        barrier.wait()
+        futures.append(engine.encode_async("abc"))
+        batchers.append(engine._batcher)
+
+    threads = [threading.Thread(target=first_call) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert all(f.result(timeout=5) is not None for f in futures)
+    engine.close()
+    assert len(built) == 1
+    assert len(set(map(id, batchers))) == 1
+    assert not any(t.name == "encode-batcher" and t.is_alive() for t in threading.enumerate())
+
+
+def test_encode_batcher_close_resolves_pending_and_rejects_new():
+    import threading
+    from local_llm_tutor.evaluation_engine import _EncodeBatcher
+    batcher = _EncodeBatcher(FakeEmbedder(), max_wait=0.5)
+    pending = [batcher.submit("abc") for _ in range(3)]
+    closer = threading.Thread(target=batcher.close)
+    closer.start()
+    closer.join(timeout=5)
+    assert not closer.is_alive()
+    assert all(f.result(timeout=1) is not None for f in pending)
+    with pytest.raises(RuntimeError):
+        batcher.submit("late")
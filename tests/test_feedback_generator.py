@@ -2,51 +2,30 @@
 import pytest
 from unittest.mock import MagicMock
 from local_llm_tutor.feedback_generator import FeedbackGenerator
-from local_llm_tutor.evaluation_engine import EvaluationResult
+from .conftest import SAMPLE_QUESTION, make_eval_result
 
 
-def make_result(verdict, score=0.8, semantic_score=0.8, concept_coverage=1.0,
-                matched=None, missing=None):
-    return EvaluationResult(
-        verdict=verdict,
-        score=score,
-        exact_match=verdict == "correct",
-        semantic_score=semantic_score,
-        concept_coverage=concept_coverage,
-        matched_concepts=matched or [],
-        missing_concepts=missing or [],
-    )
-
-
-SAMPLE_QUESTION = {
-    "question_id": 1,
-    "question": "What is Python?",
-    "expected_answer": "Python is a high-level programming language.",
-    "key_concepts": ["high-level", "programming"],
-    "difficulty": "easy",
-}
-
-
-@pytest.fixture
+@pytest.fixture(scope="module")
 def generator():
+    # FeedbackGenerator holds no per-call state, so one instance is shared.
     return FeedbackGenerator()
 
 
 def test_correct_feedback_not_empty(generator):
-    result = make_result("correct")
+    result = make_eval_result("correct")
     feedback = generator.generate(result, SAMPLE_QUESTION)
     assert len(feedback) > 0
     assert isinstance(feedback, str)
 
 
 def test_partial_feedback_mentions_missing(generator):
-    result = make_result("partial", missing=["programming", "high-level"])
+    result = make_eval_result("partial", missing=["programming", "high-level"])
     feedback = generator.generate(result, SAMPLE_QUESTION)
     assert len(feedback) > 0
 
 
 def test_incorrect_feedback_explains(generator):
-    result = make_result("incorrect", score=0.1, semantic_score=0.1, concept_coverage=0.0)
+    result = make_eval_result("incorrect", score=0.1, semantic_score=0.1, concept_coverage=0.0)
     feedback = generator.generate(result, SAMPLE_QUESTION)
     assert len(feedback) > 0
 
@@ -71,11 +50,46 @@ def test_session_summary_poor_score(generator):
     assert "5" in summary
 
 
-def test_llm_unavailable_uses_template(generator):
+def test_llm_unavailable_uses_template():
     mock_llm = MagicMock()
     mock_llm.is_available.return_value = False
     generator_with_llm = FeedbackGenerator(llm_core=mock_llm)
-    result = make_result("correct")
+    result = make_eval_result("correct")
     feedback = generator_with_llm.generate(result, SAMPLE_QUESTION)
     assert len(feedback) > 0
     mock_llm.generate_feedback.assert_not_called()
+
+
+def test_generate_stream_yields_llm_chunks():
+    mock_llm = MagicMock()
+    mock_llm.is_available.return_value = True
+    mock_llm.generate_feedback_stream.return_value = iter(["Nice ", "work."])
+    generator_with_llm = FeedbackGenerator(llm_core=mock_llm)
+    chunks = list(generator_with_llm.generate_stream(make_eval_result("correct"), SAMPLE_QUESTION))
+    assert chunks == ["Nice ", "work."]
+
+
+def test_generate_stream_falls_back_to_template(generator):
+    chunks = list(generator.generate_stream(make_eval_result("incorrect"), SAMPLE_QUESTION))
+    assert len(chunks) == 1
+    assert SAMPLE_QUESTION["expected_answer"] in chunks[0]
+
+
+def test_correct_feedback_uses_rendered_templates(generator):
+    from local_llm_tutor.feedback_generator import CORRECT_TEMPLATES, REINFORCEMENTS
+    feedback = generator.generate(make_eval_result("correct"), SAMPLE_QUESTION)
+    assert feedback in {t.format(reinforcement=r) for t in CORRECT_TEMPLATES for r in REINFORCEMENTS}
+
+
+def test_partial_render_matches_templates_and_is_memoised(generator):
+    from local_llm_tutor.feedback_generator import PARTIAL_TEMPLATES, _render_template
+    result = make_eval_result("partial", 0.5, missing=["programming"])
+    expected = {
+        t.format(missing_hint="You missed these key concepts: programming.",
+                 hint=f"The answer is: {SAMPLE_QUESTION['expected_answer']}")
+        for t in PARTIAL_TEMPLATES
+    }
+    _render_template.cache_clear()
+    for _ in range(10):
+        assert generator.generate(result, SAMPLE_QUESTION) in expected
+    assert _render_template.cache_info().currsize <= len(PARTIAL_TEMPLATES)
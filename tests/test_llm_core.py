@@ -0,0 +1,80 @@
+"""Tests for the LLMCore module."""
+from unittest.mock import MagicMock, patch
+from local_llm_tutor.llm_core import LLMCore
+
+
+def test_disabled_llm_is_unavailable():
+    llm = LLMCore(enabled=False)
+    with patch("urllib.request.urlopen") as mock_urlopen:
+        assert llm.is_available() is False
+    mock_urlopen.assert_not_called()
+
+
+def test_failed_probe_is_not_retried_during_backoff():
+    llm = LLMCore(enabled=True)
+    with patch("urllib.request.urlopen", side_effect=OSError("refused")) as mock_urlopen:
+        assert llm.is_available() is False
+        assert llm.is_available() is False
+    assert mock_urlopen.call_count == 1
+
+
+def test_failed_probe_is_retried_after_backoff():
+    llm = LLMCore(enabled=True)
+    ok = MagicMock(status=200)
+    with patch("urllib.request.urlopen", side_effect=[OSError("refused"), ok]) as mock_urlopen:
+        assert llm.is_available() is False
+        llm._next_probe_time = 0.0
+        assert llm.is_available() is True
+        assert llm.is_available() is True
+    assert mock_urlopen.call_count == 2
+    assert llm._fail_count == 0
+
+
+def _json_response(body, status=200):
+    resp = MagicMock(status=status, reason="OK")
+    resp.read.return_value = body.encode("utf-8")
+    return resp
+
+
+def test_generate_reuses_connection():
+    llm = LLMCore(enabled=True)
+    llm._available = True
+    conn = MagicMock()
+    conn.getresponse.side_effect = [
+        _json_response('{"response": " first "}'),
+        _json_response('{"response": "second"}'),
+    ]
+    with patch("http.client.HTTPConnection", return_value=conn) as mock_conn_cls:
+        assert llm.generate("one") == "first"
+        assert llm.generate("two") == "second"
+    mock_conn_cls.assert_called_once_with("localhost", 11434, timeout=10.0)
+    assert conn.request.call_count == 2
+    assert b'"keep_alive": "5m"' in conn.request.call_args.kwargs["body"]
+
+
+def test_generate_reconnects_after_dropped_connection():
+    import http.client
+    llm = LLMCore(enabled=True)
+    llm._available = True
+    stale, fresh = MagicMock(), MagicMock()
+    stale.getresponse.side_effect = http.client.RemoteDisconnected("closed")
+    fresh.getresponse.return_value = _json_response('{"response": "ok"}')
+    with patch("http.client.HTTPConnection", side_effect=[stale, fresh]):
+        assert llm.generate("prompt") == "ok"
+    stale.close.assert_called_once()
+
+
+def test_generate_stream_yields_chunks_and_keeps_connection():
+    llm = LLMCore(enabled=True)
+    llm._available = True
+    resp = MagicMock(status=200)
+    resp.__iter__.return_value = iter([
+        b'{"response": "Great ", "done": false}\n',
+        b'{"response": "job.", "done": false}\n',
+        b'{"response": "", "done": true}\n',
+    ])
+    conn = MagicMock()
+    conn.getresponse.return_value = resp
+    with patch("http.client.HTTPConnection", return_value=conn):
+        assert list(llm.generate_stream("prompt")) == ["Great ", "job."]
+    conn.close.assert_not_called()
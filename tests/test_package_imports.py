@@ -0,0 +1,34 @@
+"""Importing the core modules must not drag in the audio or ML stacks."""
+import subprocess
+import sys
+
+import pytest
+
+HEAVY_MODULES = ("pyttsx3", "sounddevice", "faster_whisper", "whisper",
+                 "sentence_transformers", "torch", "onnxruntime", "numpy")
+
+
+@pytest.mark.parametrize("module", [
+    "local_llm_tutor",
+    "local_llm_tutor.feedback_generator",
+    "local_llm_tutor.quiz_engine",
+    "local_llm_tutor.session_manager",
+    "local_llm_tutor.tutor",
+])
+def test_import_does_not_load_heavy_dependencies(module):
+    # Run in a fresh interpreter: this process has already imported them.
+    code = (
+        f"import sys, {module}\n"
+        f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    )
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True,
+                         text=True, check=True)
+    assert out.stdout.strip() == ""
+
+
+def test_dir_lists_lazy_names_once():
+    import local_llm_tutor
+    local_llm_tutor.QuizEngine  # cached into the package globals on first access
+    names = dir(local_llm_tutor)
+    assert names.count("QuizEngine") == 1
+    assert set(local_llm_tutor.__all__) <= set(names)
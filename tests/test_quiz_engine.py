@@ -1,7 +1,5 @@
 """Tests for the QuizEngine module."""
 import json
-import tempfile
-import os
 import pytest
 from local_llm_tutor.quiz_engine import QuizEngine
 
@@ -34,13 +32,12 @@ SAMPLE_QUESTIONS = [
 ]
 
 
-@pytest.fixture
-def question_bank_file():
-    with tempfile.NamedTemporaryFile(mode="w", suffix=".json", delete=False) as f:
-        json.dump(SAMPLE_QUESTIONS, f)
-        path = f.name
-    yield path
-    os.unlink(path)
+@pytest.fixture(scope="session")
+def question_bank_file(tmp_path_factory):
+    # The sample bank is never modified, so one file serves every test.
+    path = tmp_path_factory.mktemp("quiz") / "questions.json"
+    path.write_text(json.dumps(SAMPLE_QUESTIONS), encoding="utf-8")
+    return str(path)
 
 
 def test_load_questions(question_bank_file):
@@ -93,3 +90,13 @@ def test_random_mode_returns_all(question_bank_file):
     while engine.has_next():
         questions.append(engine.next_question())
     assert len(questions) == 3
+
+
+def test_random_mode_reset_keeps_filtered_set(question_bank_file):
+    engine = QuizEngine(question_bank_file, mode="random", difficulty_filter="easy")
+    engine.next_question()
+    engine.reset()
+    ids = set()
+    while engine.has_next():
+        ids.add(engine.next_question()["question_id"])
+    assert ids == {1, 2}
@@ -1,35 +1,16 @@
 """Tests for the SessionManager module."""
 import pytest
 from unittest.mock import MagicMock
+from local_llm_tutor import session_manager as session_manager_module
 from local_llm_tutor.session_manager import SessionManager
-from local_llm_tutor.evaluation_engine import EvaluationResult
+from .conftest import SAMPLE_QUESTION, make_eval_result
 
 
 @pytest.fixture
-def session(tmp_path):
-    db_file = str(tmp_path / "test_sessions.db")
-    return SessionManager(db_path=db_file)
-
-
-def make_eval_result(verdict="correct", score=0.9):
-    return EvaluationResult(
-        verdict=verdict,
-        score=score,
-        exact_match=True,
-        semantic_score=0.9,
-        concept_coverage=1.0,
-        matched_concepts=["concept1"],
-        missing_concepts=[],
-    )
-
-
-SAMPLE_QUESTION = {
-    "question_id": 1,
-    "question": "What is Python?",
-    "expected_answer": "Python is a high-level programming language.",
-    "key_concepts": ["high-level"],
-    "difficulty": "easy",
-}
+def session():
+    # In-memory DB: tests that inspect the file on disk build their own manager.
+    with SessionManager(db_path=":memory:") as manager:
+        yield manager
 
 
 def test_session_init(session):
@@ -70,3 +51,113 @@ def test_multiple_sessions_different_ids(tmp_path):
     s1 = SessionManager(db_path=db_file)
     s2 = SessionManager(db_path=db_file)
     assert s1.session_id != s2.session_id
+
+
+def _count_rows(db_path, table):
+    import sqlite3
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def test_results_written_by_background_writer(tmp_path):
+    db_file = str(tmp_path / "batch.db")
+    s = SessionManager(db_path=db_file)
+    for _ in range(SessionManager.FLUSH_THRESHOLD + 1):
+        s.record_answer(SAMPLE_QUESTION, "answer", make_eval_result(), 1.0)
+    s.flush()
+    assert _count_rows(db_file, "question_results") == SessionManager.FLUSH_THRESHOLD + 1
+    # Recording after a flush starts a fresh writer.
+    s.record_answer(SAMPLE_QUESTION, "answer", make_eval_result(), 1.0)
+    s.flush()
+    assert _count_rows(db_file, "question_results") == SessionManager.FLUSH_THRESHOLD + 2
+    s.close()
+
+
+def test_record_answer_does_not_write_on_caller_thread(tmp_path, monkeypatch):
+    import threading
+    db_file = str(tmp_path / "async.db")
+    s = SessionManager(db_path=db_file)
+    writer_threads = []
+    original = session_manager_module._write_batch
+
+    def recording_write_batch(*args):
+        writer_threads.append(threading.current_thread())
+        original(*args)
+
+    monkeypatch.setattr(session_manager_module, "_write_batch", recording_write_batch)
+    s.record_answer(SAMPLE_QUESTION, "answer", make_eval_result(), 1.0)
+    s.finalize_session()
+    assert writer_threads and threading.current_thread() not in writer_threads
+    assert _count_rows(db_file, "question_results") == 1
+    s.close()
+
+
+def test_finalize_session_flushes_pending_results(tmp_path):
+    db_file = str(tmp_path / "final.db")
+    s = SessionManager(db_path=db_file)
+    s.record_answer(SAMPLE_QUESTION, "answer", make_eval_result(), 1.0)
+    s.finalize_session()
+    assert _count_rows(db_file, "question_results") == 1
+    assert _count_rows(db_file, "sessions") == 1
+    s.close()
+
+
+def test_file_database_uses_wal(tmp_path):
+    with SessionManager(db_path=str(tmp_path / "wal.db")) as s:
+        mode = s._conn.execute("PRAGMA journal_mode").fetchone()[0]
+    assert mode == "wal"
+
+
+def test_context_manager_closes_connection(tmp_path):
+    db_file = str(tmp_path / "ctx.db")
+    with SessionManager(db_path=db_file) as s:
+        s.record_answer(SAMPLE_QUESTION, "answer", make_eval_result(), 1.0)
+    assert s._conn is None
+    assert _count_rows(db_file, "question_results") == 1
+
+
+def test_get_stats_averages(session):
+    session.record_answer(SAMPLE_QUESTION, "answer", make_eval_result("correct", 1.0), 1.0)
+    session.record_answer(SAMPLE_QUESTION, "answer", make_eval_result("partial", 0.5), 3.0)
+    stats = session.get_stats()
+    assert stats["avg_score"] == pytest.approx(0.75)
+    assert stats["avg_response_time"] == pytest.approx(2.0)
+
+
+def test_get_history_round_trips_fields(session):
+    session.record_answer(SAMPLE_QUESTION, "an answer", make_eval_result("partial", 0.5), 2.5)
+    (entry,) = session.get_history()
+    assert entry["question_id"] == 1
+    assert entry["question"] == "What is Python?"
+    assert entry["user_answer"] == "an answer"
+    assert entry["verdict"] == "partial"
+    assert entry["score"] == pytest.approx(0.5)
+    assert entry["response_time"] == pytest.approx(2.5)
+
+
+def test_get_weak_topics_orders_by_mean_score(session):
+    loops = dict(SAMPLE_QUESTION, topic="Loops")
+    types = dict(SAMPLE_QUESTION, topic="Types")
+    basics = dict(SAMPLE_QUESTION, topic="Basics")
+    session.record_answer(loops, "a", make_eval_result("partial", 0.5), 1.0)
+    session.record_answer(types, "a", make_eval_result("incorrect", 0.1), 1.0)
+    session.record_answer(basics, "a", make_eval_result("correct", 0.9), 1.0)
+    session.record_answer(loops, "a", make_eval_result("partial", 0.4), 1.0)
+    session.record_answer(SAMPLE_QUESTION, "a", make_eval_result("incorrect", 0.0), 1.0)
+    assert session.get_weak_topics() == ["Types", "Loops"]
+
+
+def test_unclosed_manager_is_collected_and_flushed(tmp_path):
+    import gc
+    db_file = str(tmp_path / "unclosed.db")
+    s = SessionManager(db_path=db_file)
+    s.record_answer(SAMPLE_QUESTION, "answer", make_eval_result(), 1.0)
+    writer = s._writer
+    del s
+    gc.collect()
+    writer.join(timeout=2.0)
+    assert not writer.is_alive()
+    assert _count_rows(db_file, "question_results") == 1
@@ -0,0 +1,70 @@
+"""Tests for the STTModule module."""
+import sys
+import types
+import numpy as np
+import pytest
+from unittest.mock import MagicMock
+from local_llm_tutor.stt_module import STTModule, clear_model_cache
+
+
+class FakeWhisperModel:
+    """Stands in for faster_whisper.WhisperModel."""
+
+    def __init__(self, *args, **kwargs):
+        self.inputs = []
+
+    def transcribe(self, audio, language=None):
+        self.inputs.append(audio)
+        segments = iter([MagicMock(text=" Python is"), MagicMock(text=" a language. ")])
+        return segments, MagicMock(language=language)
+
+
+@pytest.fixture
+def fake_faster_whisper(monkeypatch):
+    module = types.SimpleNamespace(WhisperModel=FakeWhisperModel)
+    monkeypatch.setitem(sys.modules, "faster_whisper", module)
+    clear_model_cache()
+    yield module
+    clear_model_cache()
+
+
+def test_transcribe_audio_passes_array_to_faster_whisper(fake_faster_whisper, monkeypatch):
+    stt = STTModule()
+    model = stt._get_model()
+    monkeypatch.setattr("tempfile.NamedTemporaryFile", MagicMock(side_effect=AssertionError))
+    result = stt.transcribe_audio(np.zeros(16000, dtype=np.float32))
+    assert result.text == "Python is  a language."
+    assert isinstance(model.inputs[0], np.ndarray)
+    assert model.inputs[0].dtype == np.float32
+
+
+def test_transcribe_audio_unavailable_model():
+    stt = STTModule()
+    stt._model = "unavailable"
+    result = stt.transcribe_audio(np.zeros(10, dtype=np.float32))
+    assert not result
+
+
+def test_to_pcm16_scales_and_clips():
+    from local_llm_tutor.stt_module import _to_pcm16
+    pcm = _to_pcm16(np.array([0.0, 0.5, -1.0, 1.5, -2.0]))
+    assert pcm.dtype == np.int16
+    assert pcm.tolist() == [0, 16383, -32767, 32767, -32768]
+
+
+def test_model_shared_across_instances(fake_faster_whisper):
+    assert STTModule()._get_model() is STTModule()._get_model()
+    assert STTModule(model_size="tiny")._get_model() is not STTModule()._get_model()
+
+
+def test_transcribe_stream_yields_segments(fake_faster_whisper):
+    stt = STTModule()
+    assert list(stt.transcribe_stream(np.zeros(160, dtype=np.float32))) == [
+        " Python is", " a language. "
+    ]
+
+
+def test_warm_up_loads_model(fake_faster_whisper):
+    stt = STTModule()
+    stt.warm_up()
+    assert isinstance(stt._model, FakeWhisperModel)
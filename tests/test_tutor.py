@@ -1,54 +1,47 @@
 """Tests for the Tutor orchestrator module."""
+import threading
+import pyttsx3
 import pytest
+from types import SimpleNamespace
 from unittest.mock import MagicMock, patch, call
 from local_llm_tutor.tutor import Tutor
-from local_llm_tutor.evaluation_engine import EvaluationResult
+from local_llm_tutor.tts_module import TTSModule
+from .conftest import SAMPLE_QUESTION, make_eval_result
 
 
-SAMPLE_QUESTION = {
-    "question_id": 1,
-    "question": "What is Python?",
-    "expected_answer": "Python is a high-level programming language.",
-    "key_concepts": ["high-level", "programming"],
-    "difficulty": "easy",
+# Mocks for the tutor fixture are built once and reset between tests.
+_MOCK_POOL = {
+    "evaluator": MagicMock(),
+    "feedback": MagicMock(),
+    "session": MagicMock(),
+    "speak": MagicMock(),
 }
 
 
-def make_eval_result(verdict="correct", score=0.9):
-    """Factory for EvaluationResult test objects with configurable verdict and score."""
-    return EvaluationResult(
-        verdict=verdict,
-        score=score,
-        exact_match=(verdict == "correct"),
-        semantic_score=0.9,
-        concept_coverage=1.0,
-        matched_concepts=["high-level"],
-        missing_concepts=[],
-    )
-
-
 @pytest.fixture
 def tutor():
-    quiz = MagicMock()
-    evaluator = MagicMock()
-    tts = MagicMock()
-    stt = MagicMock()
-    feedback = MagicMock()
-    session = MagicMock()
-
+    for mock in _MOCK_POOL.values():
+        mock.reset_mock(return_value=True, side_effect=True)
+    # Text-only tests never touch the quiz, TTS or STT modules, so plain
+    # stubs stand in for them; mocks are kept where calls are asserted.
     tutor_obj = Tutor(
-        quiz_engine=quiz,
-        evaluation_engine=evaluator,
-        tts_module=tts,
-        stt_module=stt,
-        feedback_generator=feedback,
-        session_manager=session,
+        quiz_engine=SimpleNamespace(),
+        evaluation_engine=_MOCK_POOL["evaluator"],
+        tts_module=SimpleNamespace(speak=lambda *_: None),
+        stt_module=SimpleNamespace(),
+        feedback_generator=_MOCK_POOL["feedback"],
+        session_manager=_MOCK_POOL["session"],
         text_only=True,
     )
-    tutor_obj.speak = MagicMock()
+    tutor_obj.speak = _MOCK_POOL["speak"]
     return tutor_obj
 
 
+def spoken_texts(mock):
+    """Return the set of texts a speak() mock was called with."""
+    return {c.args[0] for c in mock.call_args_list if c.args}
+
+
 # --- Tests for handle_special_commands ---
 
 def test_handle_quit_command(tutor):
@@ -79,6 +72,16 @@ def test_handle_repeat_command(tutor):
     assert tutor.handle_special_commands("repeat", SAMPLE_QUESTION) == "repeat"
 
 
+def test_handle_explain_command(tutor):
+    assert tutor.handle_special_commands("Can you explain more?", SAMPLE_QUESTION) == "explained"
+
+
+def test_handle_command_priority(tutor):
+    """When several commands appear, repeat takes precedence over skip/quit."""
+    assert tutor.handle_special_commands("stop, say again", SAMPLE_QUESTION) == "repeat"
+    assert tutor.handle_special_commands("quit or next", SAMPLE_QUESTION) == "skip"
+
+
 def test_handle_no_command(tutor):
     assert tutor.handle_special_commands("Python is a language", SAMPLE_QUESTION) is None
 
@@ -96,6 +99,13 @@ def test_handle_command_with_punctuation(tutor):
     assert tutor.handle_special_commands("exit!", SAMPLE_QUESTION) == "quit"
 
 
+def test_handle_whole_utterance_aliases(tutor):
+    """Bare aliases, multi-word ones included, resolve through the anchored fullmatch."""
+    assert tutor.handle_special_commands("  Say again? ", SAMPLE_QUESTION) == "repeat"
+    assert tutor.handle_special_commands("Pass...", SAMPLE_QUESTION) == "skip"
+    assert tutor.handle_special_commands(" Quit please ", SAMPLE_QUESTION) == "quit"
+
+
 # --- Tests for run_question ---
 
 def test_run_question_quit_command_ends_session(tutor):
@@ -117,7 +127,7 @@ def test_run_question_next_command_skips(tutor):
     tutor.listen = MagicMock(return_value="next")
     result = tutor.run_question(SAMPLE_QUESTION, 1, 3)
     assert result is True
-    tutor.speak.assert_any_call("Skipping this question.")
+    assert "Skipping this question." in spoken_texts(tutor.speak)
 
 
 def test_run_question_skip_command_skips(tutor):
@@ -125,7 +135,7 @@ def test_run_question_skip_command_skips(tutor):
     tutor.listen = MagicMock(return_value="skip")
     result = tutor.run_question(SAMPLE_QUESTION, 1, 3)
     assert result is True
-    tutor.speak.assert_any_call("Skipping this question.")
+    assert "Skipping this question." in spoken_texts(tutor.speak)
 
 
 def test_run_question_normal_answer_evaluates(tutor):
@@ -140,7 +150,7 @@ def test_run_question_normal_answer_evaluates(tutor):
     assert result is True
     tutor.evaluator.evaluate.assert_called_once()
     tutor.session.record_answer.assert_called_once()
-    tutor.speak.assert_any_call("Great job!")
+    assert "Great job!" in spoken_texts(tutor.speak)
 
 
 def test_run_question_repeat_does_not_consume_retries(tutor):
@@ -169,7 +179,16 @@ def test_run_question_empty_answers_exhaust_retries(tutor):
     tutor.listen = MagicMock(return_value="")
     result = tutor.run_question(SAMPLE_QUESTION, 1, 3)
     assert result is True
-    tutor.speak.assert_any_call("I couldn't hear your answer. Moving on.")
+    assert "I couldn't hear your answer. Moving on." in spoken_texts(tutor.speak)
+
+
+def test_run_question_punctuation_only_counts_as_empty(tutor):
+    """STT output with no words (e.g. "..." for silence) is retried, not evaluated."""
+    tutor.feedback.generate_intro.return_value = "Question 1 of 3. What is Python?"
+    tutor.listen = MagicMock(side_effect=["...", " … ", "¿?"])
+    assert tutor.run_question(SAMPLE_QUESTION, 1, 3) is True
+    tutor.evaluator.evaluate.assert_not_called()
+    assert "I couldn't hear your answer. Moving on." in spoken_texts(tutor.speak)
 
 
 def test_run_question_quit_after_repeats(tutor):
@@ -182,50 +201,83 @@ def test_run_question_quit_after_repeats(tutor):
 
 # --- Tests for TTS reinitialization ---
 
-def test_tts_speak_reinitializes_engine_each_call():
-    """TTSModule.speak() should reinitialize the pyttsx3 engine on each call
-    so that repeated calls keep working (avoids pyttsx3 reuse bug)."""
-    from local_llm_tutor.tts_module import TTSModule
+@pytest.fixture
+def patched_pyttsx3(monkeypatch):
+    """Replace pyttsx3.init with a mock that returns one shared mock engine."""
+    engine = MagicMock()
+    engine.getProperty.return_value = []  # no voices
+    monkeypatch.setattr("pyttsx3.init", MagicMock(return_value=engine))
+    return engine
+
+
+def test_tts_speak_reuses_engine_by_default(patched_pyttsx3):
+    """TTSModule.speak() keeps one pyttsx3 engine alive across utterances."""
+    tts = TTSModule()
+    tts.speak("Hello")
+    tts.speak("World")
+
+    assert pyttsx3.init.call_count == 1
+    assert patched_pyttsx3.say.call_count == 2
+    assert patched_pyttsx3.runAndWait.call_count == 2
 
-    mock_engine = MagicMock()
-    mock_engine.getProperty.return_value = []  # no voices
 
-    with patch("pyttsx3.init", return_value=mock_engine) as mock_init:
+def test_tts_init_engine_called_once_per_session(patched_pyttsx3):
+    """A whole session of utterances initializes the engine exactly once."""
+    with patch.object(TTSModule, "_init_engine", autospec=True,
+                      side_effect=TTSModule._init_engine) as init_spy:
         tts = TTSModule()
-        tts.speak("Hello")
-        tts.speak("World")
+        for text in ("Welcome!", "Question 1 of 2.", "Correct!", "Session complete!"):
+            tts.speak(text)
+        tts.speak_stream(iter(["Great ", "job. ", "Bye."]))
+
+    assert init_spy.call_count == 1
+
+
+def test_tts_speak_rebuilds_engine_on_runtime_error(patched_pyttsx3):
+    """A RuntimeError from a stale engine triggers one rebuild and a retry."""
+    stale_engine, fresh_engine = MagicMock(), MagicMock()
+    stale_engine.getProperty.return_value = []
+    fresh_engine.getProperty.return_value = []
+    stale_engine.runAndWait.side_effect = RuntimeError("run loop already started")
+    pyttsx3.init.side_effect = [stale_engine, fresh_engine]
+
+    tts = TTSModule()
+    tts.speak("Hello")
+
+    fresh_engine.say.assert_called_once_with("Hello")
+    fresh_engine.runAndWait.assert_called_once()
+
+
+def test_tts_speak_reinitializes_engine_each_call(patched_pyttsx3):
+    """With reinit_per_utterance, TTSModule.speak() reinitializes the pyttsx3
+    engine on each call so that repeated calls keep working (avoids pyttsx3
+    reuse bug)."""
+    tts = TTSModule(reinit_per_utterance=True)
+    tts.speak("Hello")
+    tts.speak("World")
 
     # pyttsx3.init should be called: once during __init__ + once per speak() call
     expected_init_calls = 1 + 2  # 1 in __init__, 1 per speak call
-    assert mock_init.call_count == expected_init_calls
-    assert mock_engine.say.call_count == 2
-    assert mock_engine.runAndWait.call_count == 2
+    assert pyttsx3.init.call_count == expected_init_calls
+    assert patched_pyttsx3.say.call_count == 2
+    assert patched_pyttsx3.runAndWait.call_count == 2
 
 
-def test_tts_speak_does_not_stop_engine_after_each_call():
+def test_tts_speak_does_not_stop_engine_after_each_call(patched_pyttsx3):
     """TTSModule.speak() must NOT call engine.stop() after a normal utterance.
 
-    pyttsx3 caches the engine in an internal WeakValueDictionary keyed by
-    driver name.  Dropping the strong reference (self._engine = None) is
-    sufficient to let the WeakValueDictionary entry be garbage-collected so
-    the next pyttsx3.init() call creates a truly fresh engine.
-
-    Calling stop() after runAndWait() is harmful: stop() interrupts audio
-    that is still buffered in the OS audio layer, causing longer explanations
-    to be cut off even though runAndWait() has already returned.
+    The engine is kept alive and reused for the next utterance, so there is
+    nothing to tear down between calls.  Calling stop() after runAndWait() is
+    harmful: stop() interrupts audio that is still buffered in the OS audio
+    layer, causing longer explanations to be cut off even though runAndWait()
+    has already returned.
     """
-    from local_llm_tutor.tts_module import TTSModule
-
-    mock_engine = MagicMock()
-    mock_engine.getProperty.return_value = []  # no voices
-
-    with patch("pyttsx3.init", return_value=mock_engine):
-        tts = TTSModule()
-        tts.speak("Hello")
-        tts.speak("World")
+    tts = TTSModule()
+    tts.speak("Hello")
+    tts.speak("World")
 
     # stop() must NOT be called during normal speak() completion
-    assert mock_engine.stop.call_count == 0
+    assert patched_pyttsx3.stop.call_count == 0
 
 
 # --- Tests for voice gender selection ---
@@ -239,73 +291,138 @@ def _make_voice(name, vid, gender=None):
     return v
 
 
-def test_tts_selects_female_voice_by_gender_attribute():
+def test_tts_selects_female_voice_by_gender_attribute(patched_pyttsx3):
     """_select_voice picks a voice whose gender attribute equals 'female'."""
-    from local_llm_tutor.tts_module import TTSModule
 
     male_voice = _make_voice("David", "com.apple.speech.synthesis.voice.david", "male")
     female_voice = _make_voice("Samantha", "com.apple.speech.synthesis.voice.samantha", "female")
-    voices = [male_voice, female_voice]
-
-    mock_engine = MagicMock()
-    mock_engine.getProperty.return_value = voices
+    patched_pyttsx3.getProperty.return_value = [male_voice, female_voice]
 
-    with patch("pyttsx3.init", return_value=mock_engine):
-        tts = TTSModule(voice_gender="female")
+    TTSModule(voice_gender="female")
 
-    selected_id = mock_engine.setProperty.call_args_list[-1][0][1]
+    selected_id = patched_pyttsx3.setProperty.call_args_list[-1][0][1]
     assert selected_id == female_voice.id
 
 
-def test_tts_selects_female_voice_by_name_keyword():
+def test_tts_selects_female_voice_by_name_keyword(patched_pyttsx3):
     """_select_voice falls back to name-based matching when gender attr is absent."""
-    from local_llm_tutor.tts_module import TTSModule
 
     male_voice = _make_voice("David", "voice.david", None)
     female_voice = _make_voice("Microsoft Zira Desktop", "voice.zira.female", None)
-    voices = [male_voice, female_voice]
+    patched_pyttsx3.getProperty.return_value = [male_voice, female_voice]
 
-    mock_engine = MagicMock()
-    mock_engine.getProperty.return_value = voices
+    TTSModule(voice_gender="female")
 
-    with patch("pyttsx3.init", return_value=mock_engine):
-        tts = TTSModule(voice_gender="female")
-
-    selected_id = mock_engine.setProperty.call_args_list[-1][0][1]
+    selected_id = patched_pyttsx3.setProperty.call_args_list[-1][0][1]
     assert selected_id == female_voice.id
 
 
-def test_tts_falls_back_to_voice_index_when_no_gender_match():
+def test_tts_falls_back_to_voice_index_when_no_gender_match(patched_pyttsx3):
     """When no voice matches the requested gender, voice_index is used."""
-    from local_llm_tutor.tts_module import TTSModule
 
     voice_a = _make_voice("Voice A", "voice.a", "male")
     voice_b = _make_voice("Voice B", "voice.b", "male")
-    voices = [voice_a, voice_b]
-
-    mock_engine = MagicMock()
-    mock_engine.getProperty.return_value = voices
+    patched_pyttsx3.getProperty.return_value = [voice_a, voice_b]
 
-    with patch("pyttsx3.init", return_value=mock_engine):
-        tts = TTSModule(voice_index=1, voice_gender="female")
+    TTSModule(voice_index=1, voice_gender="female")
 
-    selected_id = mock_engine.setProperty.call_args_list[-1][0][1]
+    selected_id = patched_pyttsx3.setProperty.call_args_list[-1][0][1]
     assert selected_id == voice_b.id
 
 
-def test_tts_default_voice_gender_is_none():
+def test_tts_default_voice_gender_is_none(patched_pyttsx3):
     """When voice_gender is not set, voice_index selection is used as before."""
-    from local_llm_tutor.tts_module import TTSModule
 
     voice_a = _make_voice("Voice A", "voice.a", "male")
     voice_b = _make_voice("Voice B", "voice.b", "female")
-    voices = [voice_a, voice_b]
+    patched_pyttsx3.getProperty.return_value = [voice_a, voice_b]
 
-    mock_engine = MagicMock()
-    mock_engine.getProperty.return_value = voices
+    TTSModule(voice_index=0)  # no voice_gender
 
-    with patch("pyttsx3.init", return_value=mock_engine):
-        tts = TTSModule(voice_index=0)  # no voice_gender
-
-    selected_id = mock_engine.setProperty.call_args_list[-1][0][1]
+    selected_id = patched_pyttsx3.setProperty.call_args_list[-1][0][1]
     assert selected_id == voice_a.id
+
+
+def test_tts_speak_stream_speaks_whole_sentences(patched_pyttsx3):
+    """speak_stream() buffers streamed chunks and speaks one sentence at a time."""
+    tts = TTSModule()
+    tts.speak_stream(iter(["Great ", "job! You got", " it. Keep", " going"]))
+
+    spoken = [c.args[0] for c in patched_pyttsx3.say.call_args_list]
+    assert spoken == ["Great job!", "You got it.", "Keep going"]
+
+
+def test_voice_intro_warms_up_stt_while_speaking():
+    """In voice mode the intro is spoken while the STT model loads."""
+    tts, stt, audio = MagicMock(), MagicMock(), MagicMock()
+    feedback = MagicMock()
+    feedback.generate_intro.return_value = "Question 1 of 3. What is Python?"
+    voice_tutor = Tutor(
+        quiz_engine=MagicMock(),
+        evaluation_engine=MagicMock(),
+        tts_module=tts,
+        stt_module=stt,
+        feedback_generator=feedback,
+        session_manager=MagicMock(),
+        audio_controller=audio,
+        text_only=False,
+    )
+    voice_tutor.listen = MagicMock(return_value="skip")
+    voice_tutor.speak = MagicMock()
+    speak_threads = []
+    tts.speak.side_effect = lambda *_: speak_threads.append(threading.current_thread())
+
+    assert voice_tutor.run_question(SAMPLE_QUESTION, 1, 3) is True
+    tts.speak.assert_any_call("Question 1 of 3. What is Python?", True)
+    # The TTS engine is only ever driven from the thread that created it.
+    assert speak_threads == [threading.current_thread()]
+    stt.warm_up.assert_called_once()
+    audio.warm_up.assert_called_once()
+
+
+def _streaming_voice_tutor(segment_texts, decoded):
+    """Voice-mode Tutor whose STT streams *segment_texts*, logging each one pulled."""
+
+    def segments(_audio):
+        for seg in segment_texts:
+            decoded.append(seg)
+            yield seg
+
+    stt = MagicMock()
+    stt.transcribe_stream.side_effect = segments
+    return Tutor(
+        quiz_engine=MagicMock(),
+        evaluation_engine=MagicMock(),
+        tts_module=MagicMock(),
+        stt_module=stt,
+        feedback_generator=MagicMock(),
+        session_manager=MagicMock(),
+        audio_controller=MagicMock(),
+        text_only=False,
+    )
+
+
+def test_voice_listen_stops_decoding_after_skip():
+    """Streaming STT stops pulling segments once a bare skip command is heard."""
+    decoded = []
+    voice_tutor = _streaming_voice_tutor([" Skip.", " this one", " please"], decoded)
+    assert voice_tutor.listen() == "Skip."
+    assert decoded == [" Skip."]
+
+
+def test_voice_listen_keeps_decoding_for_outranking_command():
+    """A later segment's higher-priority command still wins over an earlier quit."""
+    decoded = []
+    voice_tutor = _streaming_voice_tutor([" Stop.", " Can you repeat that?"], decoded)
+    text = voice_tutor.listen()
+    assert decoded == [" Stop.", " Can you repeat that?"]
+    voice_tutor.speak = MagicMock()
+    assert voice_tutor.handle_special_commands(text, SAMPLE_QUESTION) == "repeat"
+
+
+def test_tts_gender_pattern_compiled_once_per_gender(patched_pyttsx3):
+    """The gender regex is cached and only rebuilt when voice_gender changes."""
+    tts = TTSModule(voice_gender="female")
+    pattern = tts._gender_pattern("female")
+    assert tts._gender_pattern("female") is pattern
+    assert tts._gender_pattern("male") is not pattern